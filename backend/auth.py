@@ -1,17 +1,21 @@
 """
 Authentication and security utilities
 """
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
 from jose import JWTError, jwt
 from fastapi import APIRouter,Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import os
 import re
-from dotenv import load_dotenv
-from models import User
+import time
+import hashlib
+from utils.env import load_env
+from models import User, UserRole
 from database import get_database
-from utils.security import verify_password, hash_password
+from utils.security import hash_password_async
+from utils.cache import TTLCache
+from logging_config import get_logger
 from pydantic import BaseModel, EmailStr
 
 
@@ -50,7 +54,7 @@ async def reset_password(
             detail="Password must contain uppercase, number, and special character"
         )
 
-    hashed_password = hash_password(data.new_password)
+    hashed_password = await hash_password_async(data.new_password)
 
     await db.users.update_one(
         {"email": data.email},
@@ -62,17 +66,105 @@ async def reset_password(
             }
         }
     )
+    await revoke_user_tokens(db, user.get("username"))
 
     return {"message": "Password reset successful"}
 
 
-load_dotenv()
+load_env()
 
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))
 
 security = HTTPBearer(auto_error=False)  # Don't auto-error, we'll handle it
+logger = get_logger("auth")
+
+# Authenticated principals keyed by (sub, token fingerprint), stored with the
+# time they were cached. Entries older than the user's last recorded change
+# (`token_revocations`, shared by all workers) are dropped on lookup.
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_SIZE = int(os.getenv("AUTH_CACHE_MAX_SIZE", "2048"))
+_user_cache = TTLCache(maxsize=AUTH_CACHE_MAX_SIZE, ttl=AUTH_CACHE_TTL_SECONDS)
+
+
+def _token_fingerprint(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+
+
+def invalidate_cached_user(username: Optional[str] = None, user_id: Optional[str] = None) -> None:
+    """Drop cached principals for a user after a write to their users document"""
+    if username is None and user_id is None:
+        return
+    _user_cache.discard_where(
+        lambda key, entry: (username is not None and key[0] == username)
+        or (user_id is not None and str(entry[1].id) == str(user_id))
+    )
+
+
+def clear_user_cache() -> None:
+    """Drop every cached principal"""
+    _user_cache.clear()
+
+
+# ==================== CLAIMS MODE ====================
+# Bump TOKEN_EPOCH to stop trusting the claims of every token issued so far.
+TOKEN_EPOCH = int(os.getenv("TOKEN_EPOCH", "1"))
+REVOCATION_REFRESH_SECONDS = float(os.getenv("REVOCATION_REFRESH_SECONDS", "30"))
+
+# username -> unix time at which the claims in that user's tokens went stale
+_revoked_subjects: Dict[str, float] = {}
+_revocations_loaded_at = 0.0
+
+
+class TokenPrincipal(BaseModel):
+    """Caller identity built from verified JWT claims (no users lookup)"""
+    id: Optional[str] = None
+    username: str
+    role: UserRole
+    is_active: bool = True
+
+
+async def revoke_user_tokens(db, username: Optional[str]) -> None:
+    """
+    Mark claims in the user's existing tokens as stale (any write to their
+    users document). Such tokens keep working but are re-checked against
+    the users collection, and cached principals are dropped in every worker
+    (others notice within REVOCATION_REFRESH_SECONDS).
+    """
+    if not username:
+        return
+    invalidate_cached_user(username=username)
+    revoked_at = time.time()
+    _revoked_subjects[username] = revoked_at
+    await db.token_revocations.update_one(
+        {"username": username},
+        {"$set": {"revoked_at": datetime.utcfromtimestamp(revoked_at)}},
+        upsert=True
+    )
+
+
+async def _refresh_revocations(db) -> None:
+    """Reload the revocation set written by other workers"""
+    global _revocations_loaded_at
+    now = time.time()
+    if now - _revocations_loaded_at < REVOCATION_REFRESH_SECONDS:
+        return
+    _revocations_loaded_at = now
+    cutoff = datetime.utcnow() - timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    async for entry in db.token_revocations.find({"revoked_at": {"$gte": cutoff}}):
+        revoked_at = entry["revoked_at"].replace(tzinfo=timezone.utc).timestamp()
+        if revoked_at > _revoked_subjects.get(entry["username"], 0):
+            _revoked_subjects[entry["username"]] = revoked_at
+
+
+def _claims_trusted(payload: dict) -> bool:
+    if payload.get("epoch") != TOKEN_EPOCH or not payload.get("role"):
+        return False
+    issued_at = payload.get("iat")
+    if issued_at is None:
+        return False
+    return issued_at > _revoked_subjects.get(payload["sub"], 0)
 
 
 
@@ -81,7 +173,7 @@ def create_access_token(data: dict) -> str:
     """Create JWT token"""
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": int(time.time()), "epoch": TOKEN_EPOCH})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -102,18 +194,17 @@ async def get_current_user(
     try:
         # Check if credentials were provided
         if credentials is None:
-            print(f"[Auth] No credentials provided (no Authorization header)")
+            logger.info("auth rejected", extra={"reason": "no_credentials"})
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="No authorization header provided"
             )
 
         token = credentials.credentials
-        print(f"[Auth] Token received, length: {len(token) if token else 0}")
         payload = decode_access_token(token)
 
         if payload is None:
-            print(f"[Auth] Token decode failed")
+            logger.info("auth rejected", extra={"reason": "token_decode_failed"})
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials - token decode failed"
@@ -121,24 +212,38 @@ async def get_current_user(
 
         username: str = payload.get("sub")
         if username is None:
-            print(f"[Auth] No username in token payload")
+            logger.info("auth rejected", extra={"reason": "no_subject"})
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials - no username"
             )
 
+        cache_key = (username, _token_fingerprint(token))
+        cached = _user_cache.get(cache_key)
+        if cached is not None:
+            try:
+                await _refresh_revocations(db)
+            except Exception:
+                pass  # Keep serving from the last known revocation set
+            cached_at, user = cached
+            if cached_at > _revoked_subjects.get(username, 0):
+                return user
+            _user_cache.pop(cache_key)
+
         user_data = await db.users.find_one({"username": username})
         if user_data is None:
-            print(f"[Auth] User not found: {username}")
+            logger.info("auth rejected", extra={"reason": "user_not_found", "username": username})
             raise HTTPException(status_code=404, detail=f"User not found: {username}")
 
         user_data["_id"] = str(user_data["_id"])
-        print(f"[Auth] User authenticated: {username}, role: {user_data.get('role')}")
-        return User(**user_data)
+        logger.debug("user authenticated", extra={"username": username, "role": user_data.get("role")})
+        user = User(**user_data)
+        _user_cache.set(cache_key, (time.time(), user))
+        return user
     except HTTPException:
         raise
     except Exception as e:
-        print(f"[Auth] Unexpected error: {type(e).__name__}: {str(e)}")
+        logger.exception("unexpected authentication error")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Authentication error: {str(e)}"
@@ -157,3 +262,38 @@ async def get_admin_user(current_user: User = Depends(get_current_active_user))
     return current_user
 
 
+async def get_token_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db = Depends(get_database)
+) -> TokenPrincipal:
+    """
+    Claims-mode dependency for routes that only need the caller's id/role.
+    Trusts the role claim of current-epoch tokens that were not revoked;
+    anything else falls back to the full users lookup.
+    """
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="No authorization header provided"
+        )
+
+    payload = decode_access_token(credentials.credentials)
+    if payload is None or payload.get("sub") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials - token decode failed"
+        )
+
+    try:
+        await _refresh_revocations(db)
+    except Exception:
+        pass  # Keep serving from the last known revocation set
+
+    if _claims_trusted(payload):
+        try:
+            return TokenPrincipal(id=payload.get("uid"), username=payload["sub"], role=payload["role"])
+        except ValueError:
+            pass
+
+    user = await get_current_active_user(await get_current_user(credentials, db))
+    return TokenPrincipal(id=user.id, username=user.username, role=user.role, is_active=user.is_active)
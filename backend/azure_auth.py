@@ -11,12 +11,16 @@ from pydantic import BaseModel
 from typing import Optional
 from functools import lru_cache
 from database import get_database
-from dotenv import load_dotenv
+from auth import revoke_user_tokens
+from dashboard_counters import record_change
+from logging_config import get_logger
+from utils.env import load_env
 
-load_dotenv()
+load_env()
 
 # Azure AD configuration
 security = HTTPBearer(auto_error=False)
+logger = get_logger("azure")
 
 # Admin emails that are auto-approved with admin role
 ADMIN_EMAILS = [
@@ -77,9 +81,6 @@ async def validate_azure_token(token: str) -> AzureUser:
             detail="Azure AD SSO is not configured"
         )
     
-    print(f"[Azure SSO] Validating token via Microsoft Graph API...")
-    print(f"[Azure SSO] Token length: {len(token)}")
-    
     try:
         # Validate by calling Microsoft Graph API
         async with httpx.AsyncClient() as client:
@@ -89,28 +90,26 @@ async def validate_azure_token(token: str) -> AzureUser:
                 timeout=10.0
             )
             
-            print(f"[Azure SSO] Graph API response status: {response.status_code}")
-            
             if response.status_code == 401:
                 try:
                     error_detail = response.json()
                 except:
                     error_detail = response.text
-                print(f"[Azure SSO] Graph API 401 error: {error_detail}")
+                logger.warning("graph token rejected", extra={"status": 401, "detail": error_detail})
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Invalid Azure AD token - rejected by Microsoft Graph"
                 )
             
             if response.status_code != 200:
-                print(f"[Azure SSO] Graph API error: {response.status_code} - {response.text}")
+                logger.warning("graph request failed", extra={"status": response.status_code, "detail": response.text})
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail=f"Microsoft Graph API error: {response.status_code}"
                 )
             
             user_data = response.json()
-            print(f"[Azure SSO] Successfully authenticated user: {user_data.get('userPrincipalName')}")
+            logger.debug("azure user authenticated", extra={"upn": user_data.get("userPrincipalName")})
             
             return AzureUser(
                 oid=user_data.get("id", ""),
@@ -124,7 +123,7 @@ async def validate_azure_token(token: str) -> AzureUser:
     except HTTPException:
         raise
     except Exception as e:
-        print(f"[Azure SSO] Unexpected error: {type(e).__name__}: {str(e)}")
+        logger.exception("azure token validation failed")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Failed to validate token: {str(e)}"
@@ -144,15 +143,14 @@ async def get_or_create_azure_user(azure_user: AzureUser, db):
 
     if user:
         # Update user info from Azure (in case name/email changed)
-        await db.users.update_one(
-            {"_id": user["_id"]},
-            {
-                "$set": {
-                    "email": email,
-                    "name": azure_user.name or f"{azure_user.given_name or ''} {azure_user.family_name or ''}".strip(),
-                }
-            }
-        )
+        profile = {
+            "email": email,
+            "name": azure_user.name or f"{azure_user.given_name or ''} {azure_user.family_name or ''}".strip(),
+        }
+        await db.users.update_one({"_id": user["_id"]}, {"$set": profile})
+        # Only a real change invalidates sessions (every SSO login passes here)
+        if any(user.get(field) != value for field, value in profile.items()):
+            await revoke_user_tokens(db, user.get("username"))
         return await db.users.find_one({"_id": user["_id"]})
 
     # Try to find by email (for existing users migrating to SSO)
@@ -169,6 +167,7 @@ async def get_or_create_azure_user(azure_user: AzureUser, db):
                 }
             }
         )
+        await revoke_user_tokens(db, user.get("username"))
         return await db.users.find_one({"_id": user["_id"]})
 
     # Create new user from Azure AD info
@@ -201,6 +200,7 @@ async def get_or_create_azure_user(azure_user: AzureUser, db):
     }
 
     result = await db.users.insert_one(new_user)
+    await record_change(db, "users", after=new_user)
     return await db.users.find_one({"_id": result.inserted_id})
 
 
@@ -0,0 +1,343 @@
+"""
+Materialized admin dashboard counters
+
+Write paths report the documents they change with `record_change()`;
+every counter whose filter the document enters or leaves is adjusted with
+one `$inc` bulk write on `dashboard_counters`. Counter documents:
+    {_id: "global"}        totals over the whole collection
+    {_id: "day:YYYY-MM-DD"} DSU counts keyed by the DSU `date`
+    {_id: "month:YYYY-MM"}  approved PTOs keyed by `created_at` month
+so the stats endpoint reads three documents in one query. That read always
+goes to the primary (writes land there), even through the analytics handle.
+
+A periodic reconciliation overwrites the global, today and current-month
+documents with live counts, fixing drift from writers that bypass the API.
+Live counts are grouped per collection (`plan_counts`), so all 13 metrics
+take one aggregation per collection instead of one query each.
+
+Dashboard responses are cached for DASHBOARD_CACHE_TTL_SECONDS in
+`dashboard_cache`; `record_change()` drops the entries depending on the
+collection it was told about, so API writes show up immediately in the
+worker that handled them (other workers within the TTL).
+
+Check drift with:
+    python dashboard_counters.py --check
+"""
+import asyncio
+import os
+import sys
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pymongo import ReadPreference, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from logging_config import get_logger
+from utils.cache import ResponseCache
+
+logger = get_logger("dashboard")
+
+DASHBOARD_RECONCILE_SECONDS = float(os.getenv("DASHBOARD_RECONCILE_SECONDS", "300"))
+# 0 disables caching; concurrent identical requests are still coalesced
+DASHBOARD_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "5"))
+DASHBOARD_CACHE_MAX_SIZE = int(os.getenv("DASHBOARD_CACHE_MAX_SIZE", "256"))
+
+GLOBAL = "global"
+DAY = "day"
+MONTH = "month"
+LEASE_ID = "reconcile_lease"
+
+INTERN_ROLES = ["intern", "scrum_master"]
+SUBMITTED_DSU_STATUSES = ["submitted", "approved", "completed"]
+COMPLETED_TASK_STATUSES = ["completed", "done", "finished", "COMPLETED", "DONE", "FINISHED"]
+
+
+class Counter:
+    """A count_documents() filter kept incrementally in one bucket kind"""
+    __slots__ = ("name", "collection", "filter", "bucket")
+
+    def __init__(self, name: str, collection: str, filter: dict, bucket: str = GLOBAL):
+        self.name = name
+        self.collection = collection
+        self.filter = filter
+        self.bucket = bucket
+
+    def matches(self, doc: dict) -> bool:
+        """Python equivalent of `filter` (equality and $in only)"""
+        for field, condition in self.filter.items():
+            value = doc.get(field)
+            if isinstance(condition, dict):
+                if value not in condition["$in"]:
+                    return False
+            elif value != condition:
+                return False
+        return True
+
+    def bucket_id(self, doc: dict) -> Optional[str]:
+        if self.bucket == DAY:
+            key = _day_key(doc.get("date"))
+            return f"{DAY}:{key}" if key else None
+        if self.bucket == MONTH:
+            created_at = doc.get("created_at")
+            return f"{MONTH}:{created_at:%Y-%m}" if isinstance(created_at, datetime) else None
+        return GLOBAL
+
+    def live_filter(self, bucket_id: str) -> dict:
+        """The filter restricted to one bucket, for live counts"""
+        if self.bucket == DAY:
+            return {**self.filter, "date": bucket_id.split(":", 1)[1]}
+        if self.bucket == MONTH:
+            start = datetime.strptime(bucket_id.split(":", 1)[1], "%Y-%m")
+            end = (start + timedelta(days=32)).replace(day=1)
+            return {**self.filter, "created_at": {"$gte": start, "$lt": end}}
+        return dict(self.filter)
+
+
+COUNTERS: List[Counter] = [
+    Counter("totalInterns", "users", {"role": {"$in": INTERN_ROLES}, "is_approved": True}),
+    Counter("activeInterns", "users", {"role": {"$in": INTERN_ROLES}, "is_approved": True, "is_active": True}),
+    Counter("submittedDSUs", "dsu_entries", {"status": {"$in": SUBMITTED_DSU_STATUSES}}, DAY),
+    Counter("pendingDSUs", "dsu_entries", {"status": "pending"}, DAY),
+    Counter("projectInterns", "interns", {"internType": "project"}),
+    Counter("rsInterns", "interns", {"internType": "rs"}),
+    Counter("projectInternsByType", "interns", {"type": "project"}),
+    Counter("rsInternsByType", "interns", {"type": "rs"}),
+    Counter("totalTasks", "tasks", {}),
+    Counter("completedTasks", "tasks", {"status": {"$in": COMPLETED_TASK_STATUSES}}),
+    Counter("pendingPTOs", "pto", {"status": "pending"}),
+    Counter("approvedPTOs", "pto", {"status": "approved"}, MONTH),
+    Counter("activeBatches", "batches", {"status": "active"}),
+]
+
+COUNTED_COLLECTIONS = tuple(dict.fromkeys(counter.collection for counter in COUNTERS))
+
+dashboard_cache = ResponseCache(maxsize=DASHBOARD_CACHE_MAX_SIZE, ttl=DASHBOARD_CACHE_TTL_SECONDS)
+
+_reconciler: Optional[asyncio.Task] = None
+
+
+def _day_key(value) -> Optional[str]:
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value) if value else None
+
+
+def current_buckets(today: Optional[date] = None) -> Dict[str, str]:
+    """Bucket ids the dashboard reads: {bucket kind: _id}"""
+    today = today or date.today()
+    return {GLOBAL: GLOBAL, DAY: f"{DAY}:{today.isoformat()}", MONTH: f"{MONTH}:{today:%Y-%m}"}
+
+
+def apply_set(before: dict, fields: dict) -> dict:
+    """The document after a top-level `$set` of `fields`"""
+    return {**before, **fields}
+
+
+async def record_change(db, collection: str, before: Optional[dict] = None, after: Optional[dict] = None) -> None:
+    """
+    Adjust counters for one insert (before=None), update or delete
+    (after=None). Never raises: a failed update is left to reconciliation.
+    """
+    await record_changes(db, collection, [(before, after)])
+
+
+async def record_changes(db, collection: str, changes: Iterable[Tuple[Optional[dict], Optional[dict]]]) -> None:
+    """record_change() for many (before, after) pairs with one counter write"""
+    dashboard_cache.invalidate(collection)
+
+    deltas: Dict[tuple, int] = {}
+    for before, after in changes:
+        for counter in COUNTERS:
+            if counter.collection != collection:
+                continue
+            old = counter.bucket_id(before) if before is not None and counter.matches(before) else None
+            new = counter.bucket_id(after) if after is not None and counter.matches(after) else None
+            if old == new:
+                continue
+            if old:
+                deltas[(old, counter.name)] = deltas.get((old, counter.name), 0) - 1
+            if new:
+                deltas[(new, counter.name)] = deltas.get((new, counter.name), 0) + 1
+
+    by_bucket: Dict[str, dict] = {}
+    for (bucket_id, name), delta in deltas.items():
+        if delta:
+            by_bucket.setdefault(bucket_id, {})[name] = delta
+    if not by_bucket:
+        return
+
+    try:
+        await db.dashboard_counters.bulk_write(
+            [UpdateOne({"_id": bucket_id}, {"$inc": incs}, upsert=True) for bucket_id, incs in by_bucket.items()],
+            ordered=False
+        )
+    except Exception:
+        logger.exception("dashboard counter update failed", extra={"collection": collection})
+
+
+async def read_counters(db, today: Optional[date] = None) -> Optional[Dict[str, int]]:
+    """Materialized values for the current buckets; None until first reconciled"""
+    buckets = current_buckets(today)
+    # A lagging secondary would otherwise be cached as fresh right after a write
+    counters = db.dashboard_counters.with_options(read_preference=ReadPreference.PRIMARY)
+    docs = {doc["_id"]: doc async for doc in counters.find({"_id": {"$in": list(buckets.values())}})}
+    if GLOBAL not in docs:
+        return None
+    return {
+        counter.name: int(docs.get(buckets[counter.bucket], {}).get(counter.name, 0))
+        for counter in COUNTERS
+    }
+
+
+def _expression(filter: dict):
+    """Aggregation-expression form of an equality / $in / range filter"""
+    clauses = []
+    for field, condition in filter.items():
+        if isinstance(condition, dict):
+            clauses.extend({op: [f"${field}", value]} for op, value in condition.items())
+        else:
+            clauses.append({"$eq": [f"${field}", condition]})
+    return {"$and": clauses} if clauses else True
+
+
+def plan_counts(counters: Iterable[Counter], today: Optional[date] = None) -> Dict[str, list]:
+    """
+    One pipeline per collection: $match the union of its counters' filters
+    (so indexes still apply), then a single $group summing one conditional
+    per counter.
+    """
+    buckets = current_buckets(today)
+    by_collection: Dict[str, List[Counter]] = {}
+    for counter in counters:
+        by_collection.setdefault(counter.collection, []).append(counter)
+
+    plans = {}
+    for collection, group in by_collection.items():
+        filters = [counter.live_filter(buckets[counter.bucket]) for counter in group]
+        pipeline = []
+        if all(filters):
+            pipeline.append({"$match": filters[0] if len(filters) == 1 else {"$or": filters}})
+        pipeline.append({"$group": {
+            "_id": None,
+            **{
+                counter.name: {"$sum": {"$cond": [_expression(live_filter), 1, 0]}}
+                for counter, live_filter in zip(group, filters)
+            }
+        }})
+        plans[collection] = pipeline
+    return plans
+
+
+async def live_counts(db, today: Optional[date] = None, counters: Iterable[Counter] = COUNTERS) -> Dict[str, int]:
+    """Live values of the counters: one aggregation per collection, run in parallel"""
+    counters = list(counters)
+    plans = plan_counts(counters, today)
+
+    async def _run(collection, pipeline):
+        rows = await db[collection].aggregate(pipeline).to_list(1)
+        return rows[0] if rows else {}
+
+    rows = await asyncio.gather(*(_run(collection, pipeline) for collection, pipeline in plans.items()))
+    merged = {key: value for row in rows for key, value in row.items() if key != "_id"}
+    return {counter.name: int(merged.get(counter.name, 0)) for counter in counters}
+
+
+async def reconcile(db, today: Optional[date] = None) -> Dict[str, int]:
+    """Overwrite the current buckets with live counts"""
+    buckets = current_buckets(today)
+    counts = await live_counts(db, today)
+    by_bucket: Dict[str, dict] = {}
+    for counter in COUNTERS:
+        by_bucket.setdefault(buckets[counter.bucket], {})[counter.name] = counts[counter.name]
+    now = datetime.utcnow()
+    await db.dashboard_counters.bulk_write(
+        [UpdateOne({"_id": bucket_id}, {"$set": {**values, "reconciled_at": now}}, upsert=True)
+         for bucket_id, values in by_bucket.items()],
+        ordered=False
+    )
+    return counts
+
+
+async def check_consistency(db, today: Optional[date] = None) -> dict:
+    """Compare materialized values against live counts"""
+    materialized, live = await asyncio.gather(read_counters(db, today), live_counts(db, today))
+    materialized = materialized or {}
+    counters = {
+        name: {"materialized": materialized.get(name), "live": live[name]}
+        for name in live
+    }
+    drift = {name: values for name, values in counters.items() if values["materialized"] != values["live"]}
+    return {"consistent": not drift, "drift": drift, "counters": counters}
+
+
+async def _acquire_lease(db, seconds: float) -> bool:
+    """One reconciler per interval across all workers"""
+    now = datetime.utcnow()
+    try:
+        await db.dashboard_counters.find_one_and_update(
+            {"_id": LEASE_ID, "until": {"$lte": now}},
+            {"$set": {"until": now + timedelta(seconds=seconds)}},
+            upsert=True
+        )
+        return True
+    except DuplicateKeyError:
+        return False
+
+
+async def _reconcile_forever(db, interval: float) -> None:
+    while True:
+        try:
+            if await _acquire_lease(db, interval * 0.9):
+                counts = await reconcile(db)
+                logger.debug("dashboard counters reconciled", extra={"counts": counts})
+        except Exception:
+            logger.exception("dashboard counter reconciliation failed")
+        await asyncio.sleep(interval)
+
+
+def start_reconciler(db) -> Optional[asyncio.Task]:
+    """Start the periodic reconciliation task (DASHBOARD_RECONCILE_SECONDS, 0 disables)"""
+    global _reconciler
+    if DASHBOARD_RECONCILE_SECONDS <= 0:
+        return None
+    if _reconciler is None or _reconciler.done():
+        _reconciler = asyncio.create_task(_reconcile_forever(db, DASHBOARD_RECONCILE_SECONDS))
+    return _reconciler
+
+
+def stop_reconciler() -> None:
+    global _reconciler
+    if _reconciler is not None:
+        _reconciler.cancel()
+        _reconciler = None
+
+
+async def _main(check_only: bool) -> int:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from database import get_client_options
+    from logging_config import configure_logging
+
+    configure_logging()
+    client = AsyncIOMotorClient(os.getenv("MONGODB_URL"), **get_client_options())
+    database = client[os.getenv("MONGODB_DB_NAME", "intern_lifecycle")]
+    try:
+        if check_only:
+            report = await check_consistency(database)
+            for name, values in report["counters"].items():
+                flag = "" if name not in report["drift"] else "  <-- drift"
+                print(f"{name:22s} materialized={values['materialized']} live={values['live']}{flag}")
+            return 0 if report["consistent"] else 1
+        counts = await reconcile(database)
+        print(f"Reconciled {len(counts)} counters")
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    from utils.env import load_env
+
+    load_env()
+    sys.exit(asyncio.run(_main("--check" in sys.argv)))
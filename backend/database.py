@@ -2,17 +2,29 @@
 MongoDB database connection and utilities
 """
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import ASCENDING, DESCENDING
+from pymongo.read_preferences import ReadPreference
 import os
 import asyncio
-from dotenv import load_dotenv
+import importlib.util
+from utils.env import load_env
+from indexes import check_indexes
+from intern_refs import check_intern_refs
 
-load_dotenv()
+load_env()
+
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primarypreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondarypreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
 
 # Database instance
 class Database:
     client: AsyncIOMotorClient = None
     db = None
+    analytics_db = None
 
 db = Database()
 
@@ -20,68 +32,76 @@ async def get_database():
     """Dependency to get database"""
     return db.db
 
+async def get_analytics_database():
+    """Dependency for read-mostly reporting routes (analytics read preference)"""
+    return db.analytics_db if db.analytics_db is not None else db.db
+
+
+def _default_compressors() -> str:
+    """Wire compressors whose Python bindings are installed, best first"""
+    compressors = []
+    if importlib.util.find_spec("zstandard"):
+        compressors.append("zstd")
+    if importlib.util.find_spec("snappy"):
+        compressors.append("snappy")
+    compressors.append("zlib")
+    return ",".join(compressors)
+
+
+def _read_preference(name: str):
+    try:
+        return READ_PREFERENCES[name.replace("_", "").lower()]
+    except KeyError:
+        raise ValueError(f"Unknown read preference: {name}")
+
+
+def get_client_options() -> dict:
+    """Motor client options for this deployment, driven by MONGODB_* env vars"""
+    options = {
+        "serverSelectionTimeoutMS": int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+        "connectTimeoutMS": int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "5000")),
+        "maxPoolSize": int(os.getenv("MONGODB_MAX_POOL_SIZE", "100")),
+        "minPoolSize": int(os.getenv("MONGODB_MIN_POOL_SIZE", "0")),
+        "compressors": os.getenv("MONGODB_COMPRESSORS", _default_compressors()),
+        "read_preference": _read_preference(os.getenv("MONGODB_READ_PREFERENCE", "primary")),
+        "appname": os.getenv("MONGODB_APP_NAME", "interns360"),
+    }
+    if os.getenv("MONGODB_MAX_IDLE_TIME_MS"):
+        options["maxIdleTimeMS"] = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS"))
+    if os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS"):
+        options["waitQueueTimeoutMS"] = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS"))
+    if os.getenv("MONGODB_WRITE_CONCERN"):
+        w = os.getenv("MONGODB_WRITE_CONCERN")
+        options["w"] = int(w) if w.isdigit() else w
+    if "zlib" in options["compressors"] and os.getenv("MONGODB_ZLIB_LEVEL"):
+        options["zlibCompressionLevel"] = int(os.getenv("MONGODB_ZLIB_LEVEL"))
+    return options
+
 async def connect_db():
     """Connect to MongoDB with timeout"""
     MONGODB_URL = os.getenv("MONGODB_URL")
     MONGODB_DB_NAME = os.getenv("MONGODB_DB_NAME", "intern_lifecycle")
     
     try:
-        # Create client with connection timeout
-        db.client = AsyncIOMotorClient(
-            MONGODB_URL,
-            serverSelectionTimeoutMS=5000,
-            connectTimeoutMS=5000
-        )
+        # Create client with the configured pool / compression / read preference
+        db.client = AsyncIOMotorClient(MONGODB_URL, **get_client_options())
         db.db = db.client[MONGODB_DB_NAME]
+        db.analytics_db = db.client.get_database(
+            MONGODB_DB_NAME,
+            read_preference=_read_preference(
+                os.getenv("MONGODB_ANALYTICS_READ_PREFERENCE", "secondaryPreferred")
+            )
+        )
         
         # Verify connection with timeout
         await asyncio.wait_for(db.client.admin.command('ping'), timeout=5.0)
         print(f"✅ Connected to MongoDB: {MONGODB_DB_NAME}")
         
-        # Create indexes
-        await db.db.users.create_index("email", unique=True)
-        await db.db.users.create_index("username", unique=True)
-        await db.db.users.create_index([("role", ASCENDING)])
-        await db.db.users.create_index([("is_approved", ASCENDING)])
-        await db.db.users.create_index([("is_active", ASCENDING)])
-        await db.db.users.create_index([("role", ASCENDING), ("is_approved", ASCENDING), ("is_active", ASCENDING)])
-        await db.db.users.create_index([("created_at", DESCENDING)])
-        
-        await db.db.interns.create_index("email", unique=True)
-        await db.db.interns.create_index([("status", ASCENDING)])
-        await db.db.interns.create_index([("internType", ASCENDING)])
-        await db.db.interns.create_index([("type", ASCENDING)])
-        await db.db.interns.create_index([("batch", ASCENDING)])
-        await db.db.interns.create_index([("batch", ASCENDING), ("status", ASCENDING)])
-        
-        await db.db.dsu_entries.create_index([("internId", ASCENDING), ("date", DESCENDING)])
-        await db.db.dsu_entries.create_index([("date", DESCENDING)])
-        await db.db.dsu_entries.create_index([("status", ASCENDING)])
-        await db.db.dsu_entries.create_index([("date", DESCENDING), ("status", ASCENDING)])
-        await db.db.dsu_entries.create_index([("date", DESCENDING), ("blockers", ASCENDING)])
-        await db.db.dsu_entries.create_index([("submittedAt", DESCENDING)])
-        
-        await db.db.tasks.create_index([("internId", ASCENDING)])
-        await db.db.tasks.create_index([("status", ASCENDING)])
-        await db.db.tasks.create_index([("created_at", DESCENDING)])
-        await db.db.tasks.create_index([("internId", ASCENDING), ("status", ASCENDING)])
-        
-        await db.db.pto.create_index([("internId", ASCENDING), ("status", ASCENDING), ("type", ASCENDING)])
-        await db.db.pto.create_index([("status", ASCENDING)])
-        await db.db.pto.create_index([("created_at", DESCENDING)])
-        await db.db.pto.create_index([("status", ASCENDING), ("created_at", DESCENDING)])
-        
-        await db.db.projects.create_index("name", unique=True)
-        
-        await db.db.batches.create_index("batchId", unique=True)
-        await db.db.batches.create_index([("status", ASCENDING)])
-        await db.db.batches.create_index([("startDate", DESCENDING)])
-        
-        await db.db.organizations.create_index("name", unique=True)
-        await db.db.mentor_requests.create_index([("requesterUserId", ASCENDING), ("status", ASCENDING)])
-        await db.db.mentor_requests.create_index([("mentorUserId", ASCENDING), ("status", ASCENDING)])
-        
-        print("✅ Database indexes created")
+        # Indexes are migrated by indexes.py; startup only checks the version
+        if await check_indexes(db.db):
+            print("✅ Database indexes up to date")
+        # Typed intern references: backfilled in the background when missing
+        await check_intern_refs(db.db)
     except asyncio.TimeoutError:
         print("❌ Database connection timeout - check MONGODB_URL")
         raise
@@ -0,0 +1,247 @@
+"""
+Declared MongoDB indexes and an idempotent migration runner
+
+Startup only compares SCHEMA_VERSION with the version recorded in
+`schema_meta`; when it is behind, the missing indexes are built in the
+background. Bump SCHEMA_VERSION whenever INDEX_MANIFEST changes. Before
+building, ensure_indexes() also rewrites DSU dates stored as BSON dates to
+the `YYYY-MM-DD` strings the unique (internId, date) index compares.
+
+Run before a deploy with:
+    python indexes.py            # build missing indexes, record version
+    python indexes.py --check    # only list what is missing
+
+A same-key index without `unique` does not count as a unique entry. A
+failed background build and missing unique indexes are reported by /ready.
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from logging_config import get_logger
+
+logger = get_logger("db")
+
+SCHEMA_VERSION = 6
+SCHEMA_META_ID = "indexes"
+
+TOKEN_TTL_SECONDS = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440")) * 60
+
+# One DSU per intern and day; bulk submission relies on it to reject duplicates
+DSU_UNIQUE_KEYS = [("internId", ASCENDING), ("date", ASCENDING)]
+
+# (collection, keys, options)
+INDEX_MANIFEST: List[Tuple[str, List[Tuple[str, int]], dict]] = [
+    ("users", [("email", ASCENDING)], {"unique": True}),
+    ("users", [("username", ASCENDING)], {"unique": True}),
+    ("users", [("role", ASCENDING)], {}),
+    ("users", [("is_approved", ASCENDING)], {}),
+    ("users", [("is_active", ASCENDING)], {}),
+    ("users", [("role", ASCENDING), ("is_approved", ASCENDING), ("is_active", ASCENDING)], {}),
+    # (sort field, _id) pairs back the keyset pagination of the list endpoints
+    ("users", [("created_at", DESCENDING), ("_id", DESCENDING)], {}),
+    ("users", [("role", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], {}),
+
+    ("interns", [("email", ASCENDING)], {"unique": True}),
+    ("interns", [("status", ASCENDING)], {}),
+    ("interns", [("internType", ASCENDING)], {}),
+    ("interns", [("type", ASCENDING)], {}),
+    ("interns", [("batch", ASCENDING)], {}),
+    ("interns", [("batch", ASCENDING), ("status", ASCENDING)], {}),
+
+    ("dsu_entries", DSU_UNIQUE_KEYS, {"unique": True}),
+    ("dsu_entries", [("date", DESCENDING), ("_id", DESCENDING)], {}),
+    ("dsu_entries", [("status", ASCENDING)], {}),
+    ("dsu_entries", [("date", DESCENDING), ("status", ASCENDING)], {}),
+    ("dsu_entries", [("date", DESCENDING), ("blockers", ASCENDING)], {}),
+    ("dsu_entries", [("submittedAt", DESCENDING)], {}),
+
+    ("tasks", [("internId", ASCENDING)], {}),
+    ("tasks", [("status", ASCENDING)], {}),
+    ("tasks", [("created_at", DESCENDING), ("_id", DESCENDING)], {}),
+    ("tasks", [("internId", ASCENDING), ("status", ASCENDING)], {}),
+
+    ("pto", [("internId", ASCENDING), ("status", ASCENDING), ("type", ASCENDING)], {}),
+    ("pto", [("status", ASCENDING)], {}),
+    ("pto", [("created_at", DESCENDING), ("_id", DESCENDING)], {}),
+    ("pto", [("status", ASCENDING), ("created_at", DESCENDING)], {}),
+
+    ("projects", [("name", ASCENDING)], {"unique": True}),
+
+    ("batches", [("batchId", ASCENDING)], {"unique": True}),
+    ("batches", [("status", ASCENDING)], {}),
+    ("batches", [("startDate", DESCENDING)], {}),
+
+    ("organizations", [("name", ASCENDING)], {"unique": True}),
+    ("mentor_requests", [("requesterUserId", ASCENDING), ("status", ASCENDING)], {}),
+    ("mentor_requests", [("created_at", DESCENDING), ("_id", DESCENDING)], {}),
+    ("references", [("created_at", DESCENDING), ("_id", DESCENDING)], {}),
+    ("mentor_requests", [("mentorUserId", ASCENDING), ("status", ASCENDING)], {}),
+
+    ("token_revocations", [("username", ASCENDING)], {"unique": True}),
+    ("token_revocations", [("revoked_at", ASCENDING)], {"expireAfterSeconds": TOKEN_TTL_SECONDS}),
+
+    ("otp_codes", [("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+]
+
+_background_build = None
+_build_error = None
+# (collection, key signature) of unique indexes seen in list_indexes()
+_unique_confirmed = set()
+
+
+def _key_signature(keys) -> tuple:
+    return tuple((field, int(direction) if isinstance(direction, (int, float)) else direction)
+                 for field, direction in keys)
+
+
+def _index_signature(keys, unique: bool) -> tuple:
+    # A non-unique index on the same keys does not satisfy a unique entry
+    return _key_signature(keys), bool(unique)
+
+
+async def find_missing_indexes(database) -> Dict[str, List[IndexModel]]:
+    """Manifest entries that `list_indexes()` does not report, per collection"""
+    wanted: Dict[str, list] = {}
+    for collection, keys, options in INDEX_MANIFEST:
+        wanted.setdefault(collection, []).append((keys, options))
+
+    async def _missing_for(collection):
+        existing = set()
+        async for index in database[collection].list_indexes():
+            existing.add(_index_signature(index["key"].items(), index.get("unique")))
+        return collection, [
+            IndexModel(keys, **options)
+            for keys, options in wanted[collection]
+            if _index_signature(keys, options.get("unique")) not in existing
+        ]
+
+    results = await asyncio.gather(*(_missing_for(name) for name in wanted))
+    return {collection: models for collection, models in results if models}
+
+
+async def has_unique_index(database, collection: str, keys) -> bool:
+    """True when `collection` has a unique index on exactly `keys` (cached once seen)"""
+    signature = _key_signature(keys)
+    if (collection, signature) in _unique_confirmed:
+        return True
+    async for index in database[collection].list_indexes():
+        if index.get("unique") and _key_signature(index["key"].items()) == signature:
+            _unique_confirmed.add((collection, signature))
+            return True
+    return False
+
+
+async def missing_unique_indexes(database) -> List[str]:
+    """Unique manifest entries not present yet, as `collection: fields`"""
+    entries = [(collection, keys) for collection, keys, options in INDEX_MANIFEST if options.get("unique")]
+    present = await asyncio.gather(*(has_unique_index(database, c, k) for c, k in entries))
+    return [
+        f"{collection}: {', '.join(field for field, _ in keys)}"
+        for (collection, keys), ok in zip(entries, present) if not ok
+    ]
+
+
+def index_build_status() -> dict:
+    """State of the background build started by check_indexes()"""
+    return {
+        "building": _background_build is not None and not _background_build.done(),
+        "error": _build_error
+    }
+
+
+async def get_schema_version(database) -> int:
+    meta = await database.schema_meta.find_one({"_id": SCHEMA_META_ID})
+    return meta.get("version", 0) if meta else 0
+
+
+async def normalize_dsu_dates(database) -> int:
+    """Store DSU `date` values written as BSON dates as YYYY-MM-DD strings"""
+    result = await database.dsu_entries.update_many(
+        {"date": {"$type": "date"}},
+        [{"$set": {"date": {"$dateToString": {"format": "%Y-%m-%d", "date": "$date"}}}}]
+    )
+    if result.modified_count:
+        logger.info("dsu dates normalized", extra={"documents": result.modified_count})
+    return result.modified_count
+
+
+async def ensure_indexes(database) -> Dict[str, List[str]]:
+    """Build every missing index (collections in parallel) and record the version"""
+    await normalize_dsu_dates(database)
+    missing = await find_missing_indexes(database)
+
+    async def _build(collection, models):
+        return collection, await database[collection].create_indexes(models)
+
+    built = dict(await asyncio.gather(*(_build(c, m) for c, m in missing.items())))
+    await database.schema_meta.update_one(
+        {"_id": SCHEMA_META_ID},
+        {"$set": {"version": SCHEMA_VERSION, "updated_at": datetime.now(timezone.utc)}},
+        upsert=True
+    )
+    if built:
+        logger.info("indexes built", extra={"indexes": built, "version": SCHEMA_VERSION})
+    return built
+
+
+async def check_indexes(database) -> bool:
+    """
+    Startup check: True when the recorded version is current. Otherwise the
+    missing indexes are built in a background task and False is returned.
+    """
+    global _background_build, _build_error
+    if await get_schema_version(database) >= SCHEMA_VERSION:
+        return True
+
+    if _background_build is None or _background_build.done():
+        logger.info("index schema behind, building in background", extra={"version": SCHEMA_VERSION})
+        _build_error = None
+        _background_build = asyncio.create_task(ensure_indexes(database))
+        _background_build.add_done_callback(_log_build_failure)
+    return False
+
+
+def _log_build_failure(task: asyncio.Task) -> None:
+    global _build_error
+    if not task.cancelled() and task.exception() is not None:
+        _build_error = str(task.exception())
+        logger.error("background index build failed", exc_info=task.exception())
+
+
+async def _main(check_only: bool) -> int:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from database import get_client_options
+    from logging_config import configure_logging
+
+    configure_logging()
+    client = AsyncIOMotorClient(os.getenv("MONGODB_URL"), **get_client_options())
+    database = client[os.getenv("MONGODB_DB_NAME", "intern_lifecycle")]
+    try:
+        if check_only:
+            missing = await find_missing_indexes(database)
+            for collection, models in missing.items():
+                for model in models:
+                    unique = " (unique)" if model.document.get("unique") else ""
+                    print(f"{collection}: {dict(model.document['key'])}{unique}")
+            legacy = await database.dsu_entries.count_documents({"date": {"$type": "date"}})
+            if legacy:
+                print(f"dsu_entries: {legacy} dates stored as BSON dates (normalized by the build)")
+            print(f"schema version: {await get_schema_version(database)} (manifest {SCHEMA_VERSION})")
+            return 1 if missing or legacy else 0
+        built = await ensure_indexes(database)
+        print(f"Built {sum(len(names) for names in built.values())} indexes, schema version {SCHEMA_VERSION}")
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    from utils.env import load_env
+
+    load_env()
+    sys.exit(asyncio.run(_main("--check" in sys.argv)))
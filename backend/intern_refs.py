@@ -0,0 +1,267 @@
+"""
+Typed intern references for dsu_entries and pto
+
+`internId` is stored as a string, so joining it to `interns._id` needed a
+`$toString` comparison that scans every intern for each joined document.
+Both collections now also carry `internOid` (the same id as an ObjectId,
+null when `internId` is not a valid id):
+    1. API inserts dual-write it (`with_intern_ref`)
+    2. existing documents are backfilled in batches on startup (or with
+       `python intern_refs.py`), which then records `schema_meta` "intern_refs"
+    3. once backfilled, `intern_lookup()` joins on the `_id` index with
+       localField/foreignField plus a `$project` of the requested fields
+       (MongoDB 5.0+); before that it returns the old pipeline
+
+`internOid` is internal: reads exclude it with INTERN_REF_PROJECTION.
+
+Endpoints that read a page with find() attach intern fields with
+`attach_interns()`: one `$in` query per page (misses of a short-lived
+per-worker cache), instead of one find_one per row.
+
+    python intern_refs.py --check   # documents still missing internOid
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from logging_config import get_logger
+from utils.cache import TTLCache
+
+logger = get_logger("db")
+
+INTERN_REF_FIELD = "internOid"
+INTERN_REF_COLLECTIONS = ("dsu_entries", "pto")
+INTERN_REF_PROJECTION = {INTERN_REF_FIELD: 0}
+INTERN_REFS_META_ID = "intern_refs"
+BACKFILL_BATCH_SIZE = int(os.getenv("INTERN_REFS_BACKFILL_BATCH", "1000"))
+# Fields attach_interns() can copy; cached per intern id (0 TTL disables the cache)
+INTERN_SUMMARY_FIELDS = ("name", "email", "batch")
+INTERN_CACHE_TTL_SECONDS = float(os.getenv("INTERN_CACHE_TTL_SECONDS", "30"))
+
+_intern_cache = TTLCache(maxsize=4096, ttl=INTERN_CACHE_TTL_SECONDS)
+
+_ready = False
+_backfill: Optional[asyncio.Task] = None
+
+
+def intern_oid(intern_id) -> Optional[ObjectId]:
+    """`internId` as an ObjectId, or None when it is not a valid id"""
+    if isinstance(intern_id, ObjectId):
+        return intern_id
+    return ObjectId(intern_id) if isinstance(intern_id, str) and ObjectId.is_valid(intern_id) else None
+
+
+def with_intern_ref(doc: dict) -> dict:
+    """Set `internOid` from `internId` before an insert"""
+    doc[INTERN_REF_FIELD] = intern_oid(doc.get("internId"))
+    return doc
+
+
+def strip_intern_ref(doc: dict) -> dict:
+    doc.pop(INTERN_REF_FIELD, None)
+    return doc
+
+
+async def load_interns(db, intern_ids: Iterable) -> Dict[str, dict]:
+    """Intern summaries by id string: cache hits plus one `$in` query for the rest"""
+    found: Dict[str, dict] = {}
+    missing: Dict[ObjectId, str] = {}
+    for intern_id in intern_ids:
+        oid = intern_oid(intern_id)
+        if oid is None:
+            continue
+        key = str(oid)
+        cached = _intern_cache.get(key)
+        if cached is not None:
+            found[key] = cached
+        else:
+            missing[oid] = key
+    if missing:
+        projection = {field: 1 for field in INTERN_SUMMARY_FIELDS}
+        async for intern in db.interns.find({"_id": {"$in": list(missing)}}, projection):
+            key = missing[intern.pop("_id")]
+            _intern_cache.set(key, intern)
+            found[key] = intern
+    return found
+
+
+async def attach_interns(
+    db,
+    docs: List[dict],
+    fields: Dict[str, Tuple[str, Any]],
+    unresolved: Optional[Dict[str, Any]] = None,
+    keep_existing: bool = False
+) -> List[dict]:
+    """
+    Copy intern fields onto each doc, resolving every `internId` on the page
+    at once. `fields` maps target key -> (intern field, default); docs whose
+    intern is not found get `unresolved` (or are left untouched). With
+    keep_existing, only targets that are missing or null on the doc are set.
+    """
+    interns = await load_interns(db, {doc.get("internId") for doc in docs})
+    for doc in docs:
+        oid = intern_oid(doc.get("internId"))
+        intern = interns.get(str(oid)) if oid is not None else None
+        if intern is not None:
+            values = {target: intern.get(field, default) for target, (field, default) in fields.items()}
+        else:
+            values = unresolved or {}
+        for target, value in values.items():
+            if not keep_existing or doc.get(target) is None:
+                doc[target] = value
+    return docs
+
+
+def forget_intern(intern_id) -> None:
+    """Drop a cached intern summary after the intern changed"""
+    _intern_cache.pop(str(intern_id))
+
+
+def intern_lookup(fields: List[str], as_field: str = "internDetails", email_fallback: bool = False) -> List[dict]:
+    """
+    Stages joining the intern of each document into `as_field` (a list of at
+    most one intern). With email_fallback, documents whose id matches no
+    intern are joined on `email` instead.
+    """
+    if not _ready:
+        return _legacy_intern_lookup(fields, as_field, email_fallback)
+
+    stages = [_typed_lookup(INTERN_REF_FIELD, "_id", fields, as_field)]
+    if email_fallback:
+        stages += [
+            _typed_lookup("email", "email", fields, "_internByEmail"),
+            {"$addFields": {as_field: {"$cond": [{"$gt": [{"$size": f"${as_field}"}, 0]}, f"${as_field}", "$_internByEmail"]}}},
+            {"$project": {"_internByEmail": 0}},
+        ]
+    return stages
+
+
+def _typed_lookup(local_field: str, foreign_field: str, fields: List[str], as_field: str) -> dict:
+    # Only the requested fields travel with each row, not the whole intern
+    return {
+        "$lookup": {
+            "from": "interns",
+            "localField": local_field,
+            "foreignField": foreign_field,
+            "pipeline": [{"$project": {field: 1 for field in fields}}],
+            "as": as_field
+        }
+    }
+
+
+def _legacy_intern_lookup(fields: List[str], as_field: str, email_fallback: bool) -> List[dict]:
+    """String-compare join used until the backfill has finished"""
+    match = {"$eq": [{"$toString": "$_id"}, "$$internIdStr"]}
+    if email_fallback:
+        match = {"$or": [match, {"$eq": ["$email", "$$ptoEmail"]}]}
+    variables = {"internIdStr": {"$toString": "$internId"}}
+    if email_fallback:
+        variables["ptoEmail"] = "$email"
+    return [{
+        "$lookup": {
+            "from": "interns",
+            "let": variables,
+            "pipeline": [
+                {"$match": {"$expr": match}},
+                {"$project": {field: 1 for field in fields}}
+            ],
+            "as": as_field
+        }
+    }]
+
+
+async def backfill_intern_refs(db, batch_size: int = BACKFILL_BATCH_SIZE) -> Dict[str, int]:
+    """Set `internOid` on every document missing it, in _id order, then record completion"""
+    updated = {}
+    for collection in INTERN_REF_COLLECTIONS:
+        updated[collection] = 0
+        last_id = None
+        while True:
+            query = {INTERN_REF_FIELD: {"$exists": False}}
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            docs = await db[collection].find(query, {"internId": 1}).sort("_id", 1).limit(batch_size).to_list(batch_size)
+            if not docs:
+                break
+            await db[collection].bulk_write(
+                [UpdateOne({"_id": doc["_id"], INTERN_REF_FIELD: {"$exists": False}},
+                           {"$set": {INTERN_REF_FIELD: intern_oid(doc.get("internId"))}})
+                 for doc in docs],
+                ordered=False
+            )
+            updated[collection] += len(docs)
+            last_id = docs[-1]["_id"]
+    await db.schema_meta.update_one(
+        {"_id": INTERN_REFS_META_ID},
+        {"$set": {"backfilled_at": datetime.now(timezone.utc), "updated": updated}},
+        upsert=True
+    )
+    return updated
+
+
+async def count_missing_refs(db) -> Dict[str, int]:
+    counts = await asyncio.gather(*(
+        db[collection].count_documents({INTERN_REF_FIELD: {"$exists": False}})
+        for collection in INTERN_REF_COLLECTIONS
+    ))
+    return dict(zip(INTERN_REF_COLLECTIONS, counts))
+
+
+async def _backfill_then_enable(db) -> None:
+    global _ready
+    updated = await backfill_intern_refs(db)
+    _ready = True
+    logger.info("intern references backfilled", extra={"updated": updated})
+
+
+async def check_intern_refs(db) -> bool:
+    """
+    Startup check: enable typed joins when the backfill is recorded,
+    otherwise start it in the background and keep the legacy join meanwhile.
+    """
+    global _ready, _backfill
+    if await db.schema_meta.find_one({"_id": INTERN_REFS_META_ID}):
+        _ready = True
+        return True
+    if _backfill is None or _backfill.done():
+        _backfill = asyncio.create_task(_backfill_then_enable(db))
+        _backfill.add_done_callback(_log_backfill_failure)
+    return False
+
+
+def _log_backfill_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("intern reference backfill failed", exc_info=task.exception())
+
+
+async def _main(check_only: bool) -> int:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from database import get_client_options
+    from logging_config import configure_logging
+
+    configure_logging()
+    client = AsyncIOMotorClient(os.getenv("MONGODB_URL"), **get_client_options())
+    database = client[os.getenv("MONGODB_DB_NAME", "intern_lifecycle")]
+    try:
+        if check_only:
+            missing = await count_missing_refs(database)
+            for collection, count in missing.items():
+                print(f"{collection}: {count} documents without {INTERN_REF_FIELD}")
+            return 1 if any(missing.values()) else 0
+        updated = await backfill_intern_refs(database)
+        print(f"Backfilled {INTERN_REF_FIELD}: {updated}")
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    from utils.env import load_env
+
+    load_env()
+    sys.exit(asyncio.run(_main("--check" in sys.argv)))
@@ -0,0 +1,158 @@
+"""
+Structured, non-blocking logging for the backend
+
+Records are filtered/sampled in the calling thread, pushed onto a queue and
+written to stdout by a background QueueListener, so handlers never block the
+event loop on console I/O.
+
+Environment:
+    LOG_LEVEL         default level for the "interns360" loggers (INFO)
+    LOG_LEVELS        per-module overrides, e.g. "auth=WARNING,dashboard=DEBUG"
+    LOG_SAMPLE_RATES  keep ratio for sub-WARNING records, e.g. "auth=0.01"
+    LOG_FORMAT        "json" (default) or "text"
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+ROOT_LOGGER = "interns360"
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger for a backend module, e.g. get_logger("auth")"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def _parse_mapping(value: Optional[str]) -> Dict[str, str]:
+    """Parse "a=1,b=2" into {"interns360.a": "1", "interns360.b": "2"}"""
+    mapping = {}
+    for item in (value or "").split(","):
+        if "=" not in item:
+            continue
+        name, _, setting = item.partition("=")
+        name = name.strip()
+        if not name.startswith(ROOT_LOGGER):
+            name = f"{ROOT_LOGGER}.{name}"
+        mapping[name] = setting.strip()
+    return mapping
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of sub-WARNING records from high-frequency loggers"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def _rate_for(self, name: str) -> float:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class StructuredFormatter(logging.Formatter):
+    """One JSON object (or key=value line) per record, including `extra` fields"""
+
+    def __init__(self, fmt_type: str = "json"):
+        super().__init__()
+        self.fmt_type = fmt_type
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = {
+            key: value for key, value in vars(record).items()
+            if key not in _RESERVED_ATTRS and not key.startswith("_")
+        }
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        timestamp = datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat()
+
+        if self.fmt_type == "text":
+            extras = " ".join(f"{key}={value}" for key, value in fields.items())
+            line = f"{timestamp} {record.levelname} {record.name}: {message}"
+            line = f"{line} {extras}" if extras else line
+            return f"{line}\n{record.exc_text}" if record.exc_text else line
+
+        entry = {
+            "ts": timestamp,
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": message,
+            **fields
+        }
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Enqueue the record as-is; formatting happens on the listener thread"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging() -> None:
+    """Install the queue-backed handler on the "interns360" logger (idempotent)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    root.propagate = False
+
+    for name, level in _parse_mapping(os.getenv("LOG_LEVELS")).items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    rates = {}
+    for name, rate in _parse_mapping(os.getenv("LOG_SAMPLE_RATES")).items():
+        try:
+            rates[name] = float(rate)
+        except ValueError:
+            continue
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(StructuredFormatter(os.getenv("LOG_FORMAT", "json").lower()))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(rates))
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
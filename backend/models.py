@@ -472,6 +472,10 @@ class DSUCreate(BaseModel):
     learnings: Optional[str] = None
 
 
+class DSUBulkCreate(BaseModel):
+    entries: List[DSUCreate] = Field(..., min_length=1, max_length=5000)
+
+
 class DSUUpdate(BaseModel):
     yesterday: Optional[str] = None
     today: Optional[str] = None
@@ -191,9 +191,11 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
-from dotenv import load_dotenv
+from utils.env import load_env
+from logging_config import get_logger
 
-load_dotenv()
+load_env()
+logger = get_logger("otp")
 otp_storage: Dict[str, dict] = {}
 
 class OTPService:
@@ -236,14 +238,14 @@ class OTPService:
             success = await OTPService._send_email(email, otp)
             
             if success:
-                print(f"[OTP] Sent OTP to {email}: {otp} (expires at {expires_at})")
+                logger.info("otp sent", extra={"email": email, "expires_at": expires_at})
             else:
-                print(f"[OTP] Failed to send OTP to {email}")
+                logger.warning("otp send failed", extra={"email": email})
             
             return success
             
         except Exception as e:
-            print(f"[OTP] Error sending OTP: {e}")
+            logger.exception("otp send error")
             return False
     
     @staticmethod
@@ -282,8 +284,8 @@ class OTPService:
             
             # If SMTP credentials are not configured, just log the OTP (for development)
             if not OTPService.SMTP_USERNAME or not OTPService.SMTP_PASSWORD:
-                print(f"⚠️ [OTP] SMTP not configured. OTP for {to_email}: {otp}")
-                print(f"   Configure SMTP_USERNAME and SMTP_PASSWORD in .env to send real emails")
+                logger.warning("SMTP not configured; set SMTP_USERNAME and SMTP_PASSWORD to send real emails")
+                logger.debug("dev otp", extra={"email": to_email, "otp": otp})
                 return True  # Return True for development
             
             
@@ -295,9 +297,8 @@ class OTPService:
             return True
             
         except Exception as e:
-            print(f"[OTP] Email sending error: {e}")
-        
-            print(f"📧 [DEV MODE] OTP for {to_email}: {otp}")
+            logger.exception("otp email sending error")
+            logger.debug("dev otp", extra={"email": to_email, "otp": otp})
             return True
     
     @staticmethod
@@ -309,30 +310,30 @@ class OTPService:
         try:
             # Check if OTP exists
             if email not in otp_storage:
-                print(f"[OTP] No OTP found for {email}")
+                logger.info("otp rejected", extra={"reason": "not_found", "email": email})
                 return False
             
             stored_data = otp_storage[email]
             
             # Check if already used
             if stored_data["used"]:
-                print(f"[OTP] OTP already used for {email}")
+                logger.info("otp rejected", extra={"reason": "used", "email": email})
                 return False
             
             # Check if expired
             if datetime.utcnow() > stored_data["expires_at"]:
-                print(f"[OTP] OTP expired for {email}")
+                logger.info("otp rejected", extra={"reason": "expired", "email": email})
                 del otp_storage[email]
                 return False
             
             # Check if OTP matches
             if stored_data["otp"] != otp:
-                print(f"[OTP] Invalid OTP for {email}")
+                logger.info("otp rejected", extra={"reason": "mismatch", "email": email})
                 return False
             
             
             stored_data["used"] = True
-            print(f"[OTP] OTP verified successfully for {email}")
+            logger.info("otp verified", extra={"email": email})
             
     
             del otp_storage[email]
@@ -340,7 +341,7 @@ class OTPService:
             return True
             
         except Exception as e:
-            print(f"[OTP] Verification error: {e}")
+            logger.exception("otp verification error")
             return False
     
     @staticmethod
@@ -351,4 +352,4 @@ class OTPService:
         for email in expired:
             del otp_storage[email]
         if expired:
-            print(f"[OTP] Cleaned up {len(expired)} expired OTPs")
\ No newline at end of file
+            logger.debug("expired otps removed", extra={"count": len(expired)})
\ No newline at end of file
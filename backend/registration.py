@@ -324,7 +324,8 @@ from fastapi import APIRouter, HTTPException, Depends, status
 from pydantic import BaseModel, EmailStr, validator
 from typing import Optional
 from database import get_database
-from utils.security import hash_password
+from dashboard_counters import record_change
+from utils.security import hash_password_async
 from otp_service import OTPService
 from datetime import datetime
 import re
@@ -519,7 +520,7 @@ async def register_user(
             )
         
         
-        hashed_password = hash_password(request.password)
+        hashed_password = await hash_password_async(request.password)
         
         # Generate username from email
         username = email.split('@')[0]
@@ -567,6 +568,8 @@ async def register_user(
         # Insert into database
         user_result = await db.users.insert_one(user_doc)
         intern_result = await db.interns.insert_one(intern_doc)
+        await record_change(db, "users", after=user_doc)
+        await record_change(db, "interns", after=intern_doc)
         
         print(f"[Auth] User registered: {email} (username: {username})")
         
@@ -0,0 +1,41 @@
+"""
+API routers
+
+Each module exposes `router`. Modules are imported only when they are
+enabled, so a worker started with ENABLED_ROUTERS=auth,dsu never imports
+the rest (and their dependencies).
+"""
+import importlib
+import os
+from typing import Iterable, Optional
+
+ROUTER_MODULES = [
+    "auth",
+    "users",
+    "analytics",
+    "batches",
+    "interns",
+    "dsu",
+    "tasks",
+    "pto",
+    "projects",
+]
+
+
+def enabled_routers() -> list:
+    """Router modules selected by ENABLED_ROUTERS (all of them when unset)"""
+    value = os.getenv("ENABLED_ROUTERS", "")
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = set(names) - set(ROUTER_MODULES)
+    if unknown:
+        raise ValueError(f"Unknown routers in ENABLED_ROUTERS: {', '.join(sorted(unknown))}")
+    return names or list(ROUTER_MODULES)
+
+
+def include_routers(app, names: Optional[Iterable[str]] = None) -> None:
+    """Import the enabled router modules and mount them on the app"""
+    selected = set(names) if names is not None else set(enabled_routers())
+    for name in ROUTER_MODULES:
+        if name in selected:
+            module = importlib.import_module(f"routers.{name}")
+            app.include_router(module.router)
@@ -0,0 +1,417 @@
+"""
+Admin dashboard, analytics and performance routes
+"""
+
+from datetime import date
+from functools import wraps
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pymongo import DESCENDING
+
+from database import get_database, get_analytics_database
+from auth import get_current_active_user
+from dashboard_counters import (
+    COUNTED_COLLECTIONS, dashboard_cache, read_counters, reconcile, check_consistency, live_counts
+)
+from intern_refs import INTERN_REF_PROJECTION, attach_interns, intern_lookup
+from logging_config import get_logger
+from utils.helpers import parse_object_id
+from utils.fields import FIELDS_DESCRIPTION, INTERN_FIELDS, INTERN_SUMMARY_FIELDS, projection_for
+from utils.pagination import page_query, sort_stage, split_page
+from utils.responses import FastJSONRoute
+from models import User
+
+
+router = APIRouter(tags=["analytics"], route_class=FastJSONRoute)
+
+logger = get_logger("dashboard")
+
+
+def dashboard_cached(name: str, *tags: str):
+    """
+    Serve an admin dashboard endpoint from `dashboard_cache`, keyed by
+    endpoint, role and query parameters; concurrent misses share one query.
+    Errors (including the 403 for other roles) are never cached.
+    """
+    def decorator(endpoint):
+        @wraps(endpoint)
+        async def cached_endpoint(*, db, current_user, **params):
+            key = (name, current_user.role, tuple(sorted(params.items())))
+            return await dashboard_cache.get_or_compute(
+                key, tags, lambda: endpoint(db=db, current_user=current_user, **params)
+            )
+        return cached_endpoint
+    return decorator
+
+
+# ==================== ADMIN DASHBOARD ROUTES ====================
+@router.get("/api/v1/admin/dashboard/stats")
+@dashboard_cached("stats", *COUNTED_COLLECTIONS)
+async def get_dashboard_stats(
+    live: bool = Query(False, description="Count live (one aggregation per collection) instead of reading the counters"),
+    db = Depends(get_analytics_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Dashboard statistics from the materialized dashboard_counters"""
+    
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    try:
+        # One read of the materialized counters; computed live only on
+        # request or before the first reconciliation has written them
+        counts = await live_counts(db) if live else await read_counters(db)
+        if counts is None:
+            counts = await reconcile(db)
+
+        total_interns = counts["totalInterns"]
+        active_interns = counts["activeInterns"]
+        submitted_dsus = counts["submittedDSUs"]
+        total_tasks = counts["totalTasks"]
+        completed_tasks = counts["completedTasks"]
+        
+        # Use fallback field names if primary ones return 0
+        project_interns = counts["projectInterns"] or counts["projectInternsByType"]
+        rs_interns = counts["rsInterns"] or counts["rsInternsByType"]
+        
+        # Calculate percentages
+        dsu_completion = round((submitted_dsus / active_interns * 100), 1) if active_interns > 0 else 0
+        task_completion = round((completed_tasks / total_tasks * 100), 1) if total_tasks > 0 else 0
+        
+        logger.debug(
+            "dashboard stats computed",
+            extra={"dsu_completion": dsu_completion, "task_completion": task_completion, "pending_ptos": counts["pendingPTOs"]}
+        )
+        
+        return {
+            "totalInterns": total_interns,
+            "dsuCompletion": dsu_completion,
+            "submittedDSUs": submitted_dsus,
+            "pendingDSUs": counts["pendingDSUs"],
+            "projectInterns": project_interns,
+            "rsInterns": rs_interns,
+            "taskCompletion": task_completion,
+            "completedTasks": completed_tasks,
+            "totalTasks": total_tasks,
+            "pendingPTOs": counts["pendingPTOs"],
+            "approvedPTOs": counts["approvedPTOs"],
+            "activeBatches": counts["activeBatches"]
+        }
+        
+    except Exception as e:
+        logger.exception("dashboard stats failed")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch stats: {str(e)}")
+
+
+@router.get("/api/v1/admin/dashboard/stats/consistency")
+async def get_dashboard_stats_consistency(
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Compare materialized dashboard counters against live counts (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return await check_consistency(db)
+
+
+@router.get("/api/v1/admin/dashboard/recent-interns")
+@dashboard_cached("recent-interns", "interns")
+async def get_recent_interns(
+    limit: int = 5,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db = Depends(get_analytics_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get recently added interns"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    projection = projection_for(fields, INTERN_FIELDS, INTERN_SUMMARY_FIELDS)
+    return await db.interns.find({}, projection).sort("created_at", -1).limit(limit).to_list(None)
+
+
+@router.get("/api/v1/admin/dashboard/blocked-interns")
+@dashboard_cached("blocked-interns", "dsu_entries", "interns")
+async def get_blocked_interns(
+    db = Depends(get_analytics_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get interns with blockers from today's DSU - Optimized with aggregation pipeline"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    today = date.today().isoformat()
+    
+   
+    pipeline = [
+        {
+            "$match": {
+                "date": today,
+                "blockers": {"$nin": ["", None], "$exists": True}
+            }
+        },
+        *intern_lookup(["name", "email", "batch"]),
+        {
+            "$addFields": {
+                "internName": {
+                    "$ifNull": [
+                        {"$arrayElemAt": ["$internDetails.name", 0]},
+                        "Unknown"
+                    ]
+                },
+                "internEmail": {"$arrayElemAt": ["$internDetails.email", 0]},
+                "batch": {"$arrayElemAt": ["$internDetails.batch", 0]}
+            }
+        },
+        {
+            "$project": {"internDetails": 0, **INTERN_REF_PROJECTION}
+        }
+    ]
+    
+    return await db.dsu_entries.aggregate(pipeline).to_list(None)
+
+
+@router.get("/api/v1/admin/dashboard/blocked-dsus")
+@dashboard_cached("blocked-dsus", "dsu_entries", "interns")
+async def get_blocked_dsus(
+    limit: int = 5,
+    db = Depends(get_analytics_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get DSUs with blockers from today - Optimized with aggregation pipeline"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    today = date.today().isoformat()
+    
+    
+    pipeline = [
+        {
+            "$match": {
+                "date": today,
+                "blockers": {"$nin": ["", None], "$exists": True}
+            }
+        },
+        {
+            "$limit": limit
+        },
+        *intern_lookup(["name", "email", "batch"]),
+        {
+            "$addFields": {
+                "internName": {
+                    "$ifNull": [
+                        {"$arrayElemAt": ["$internDetails.name", 0]},
+                        "Unknown"
+                    ]
+                },
+                "internEmail": {"$arrayElemAt": ["$internDetails.email", 0]},
+                "batch": {"$arrayElemAt": ["$internDetails.batch", 0]}
+            }
+        },
+        {
+            "$project": {"internDetails": 0, **INTERN_REF_PROJECTION}
+        }
+    ]
+    
+    return await db.dsu_entries.aggregate(pipeline).to_list(None)
+
+
+@router.get("/api/v1/admin/dashboard/recent-dsus")
+@dashboard_cached("recent-dsus", "dsu_entries", "interns")
+async def get_recent_dsus(
+    limit: int = 5,
+    db = Depends(get_analytics_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get recently submitted DSU entries"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    dsus = await db.dsu_entries.find({}, INTERN_REF_PROJECTION).sort("submittedAt", -1).limit(limit).to_list(None)
+    
+    # Intern names for the whole page in one query
+    return await attach_interns(db, dsus, {"internName": ("name", "Unknown")}, unresolved={"internName": "Unknown"})
+
+
+@router.get("/api/v1/admin/dashboard/pending-ptos")
+@dashboard_cached("pending-ptos", "pto", "interns")
+async def get_pending_ptos(
+    limit: int = 5,
+    db = Depends(get_analytics_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get pending PTO requests"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    ptos = await db.pto.find({"status": "pending"}, INTERN_REF_PROJECTION).sort("created_at", -1).limit(limit).to_list(None)
+    
+    # Intern details for the whole page in one query
+    return await attach_interns(db, ptos, {"internName": ("name", "Unknown"), "batch": ("batch", "")})
+
+
+# ==================== ANALYTICS ROUTES ====================
+@router.get("/api/v1/admin/analytics/batch-performance")
+@dashboard_cached("batch-performance", "batches", "interns", "tasks", "dsu_entries")
+async def get_batch_performance(
+    db = Depends(get_analytics_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get performance analytics by batch"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    batches = await db.batches.find({"status": {"$in": ["active", "completed"]}}).to_list(None)
+    
+    # Per-intern completion % and streak summed per batch in one aggregation;
+    # the averages are divided and rounded here exactly as before
+    pipeline = [
+        {"$match": {"batch": {"$in": [batch.get("batchId") for batch in batches]}}},
+        {"$group": {
+            "_id": "$batch",
+            "completionSum": {"$sum": {"$multiply": [
+                {"$divide": [
+                    {"$ifNull": ["$completedTasks", 0]},
+                    {"$max": [{"$ifNull": ["$taskCount", 1]}, 1]}
+                ]},
+                100
+            ]}},
+            "streakSum": {"$sum": {"$ifNull": ["$dsuStreak", 0]}},
+            "interns": {"$sum": 1}
+        }}
+    ]
+    totals = {row["_id"]: row async for row in db.interns.aggregate(pipeline)} if batches else {}
+    
+    for batch in batches:
+        row = totals.get(batch.get("batchId"))
+        if row:
+            batch["avgTaskCompletion"] = round(row["completionSum"] / row["interns"], 2)
+            batch["avgDSUStreak"] = round(row["streakSum"] / row["interns"], 1)
+        else:
+            batch["avgTaskCompletion"] = 0
+            batch["avgDSUStreak"] = 0
+    
+    return batches
+
+
+PERFORMANCE_USER_SORT = [("created_at", DESCENDING), ("_id", DESCENDING)]
+PERFORMANCE_PROFILE_FIELDS = (
+    "batch", "internType", "taskCount", "completedTasks", "dsuStreak",
+    "currentProject", "phone", "college", "cgpa", "joinedDate", "skills"
+)
+
+
+@router.get("/api/v1/admin/performance/users")
+async def list_performance_users(
+    response: Response,
+    role: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; all users when omitted"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    db = Depends(get_analytics_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    List intern/scrum master users for performance dashboards, joined with
+    their intern profile by email. Paged with `limit`/`cursor`; the next
+    page's cursor is returned in the X-Next-Cursor header.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    if role:
+        query = {"role": role}
+    else:
+        query = {"role": {"$in": ["intern", "scrum_master"]}}
+    if cursor:
+        query = page_query(query, PERFORMANCE_USER_SORT, cursor)
+        limit = limit or 100
+
+    pipeline = [{"$match": query}, sort_stage(PERFORMANCE_USER_SORT)]
+    if limit:
+        pipeline.append({"$limit": limit + 1})
+    pipeline += [
+        {"$lookup": {"from": "interns", "localField": "email", "foreignField": "email", "as": "profile"}},
+        {"$project": {
+            "created_at": 1, "name": 1, "email": 1, "role": 1, "employee_id": 1, "is_active": 1, "is_approved": 1,
+            "profile._id": 1, **{f"profile.{field}": 1 for field in PERFORMANCE_PROFILE_FIELDS}
+        }}
+    ]
+    rows = await db.users.aggregate(pipeline).to_list(None)
+    if limit:
+        rows, next_cursor = split_page(rows, limit, PERFORMANCE_USER_SORT)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+
+    users = []
+    for user in rows:
+        payload = {
+            "id": str(user["_id"]),
+            "name": user.get("name"),
+            "email": user.get("email"),
+            "role": user.get("role"),
+            "employee_id": user.get("employee_id"),
+            "is_active": user.get("is_active", True),
+            "is_approved": user.get("is_approved", False)
+        }
+
+        if user["profile"]:
+            intern_profile = user["profile"][0]
+            payload.update({
+                "internId": str(intern_profile["_id"]),
+                "batch": intern_profile.get("batch"),
+                "internType": intern_profile.get("internType"),
+                "taskCount": intern_profile.get("taskCount", 0),
+                "completedTasks": intern_profile.get("completedTasks", 0),
+                "dsuStreak": intern_profile.get("dsuStreak", 0),
+                "currentProject": intern_profile.get("currentProject"),
+                "phone": intern_profile.get("phone"),
+                "college": intern_profile.get("college"),
+                "cgpa": intern_profile.get("cgpa"),
+                "joinedDate": intern_profile.get("joinedDate"),
+                "skills": intern_profile.get("skills", [])
+            })
+
+        users.append(payload)
+
+    return users
+
+
+@router.get("/api/v1/admin/performance/activity")
+async def get_performance_activity(
+    user_id: str = Query(...),
+    limit: int = Query(50, ge=1, le=200),
+    db = Depends(get_analytics_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get activity details for a user (intern or scrum master)"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    user = await db.users.find_one({"_id": parse_object_id(user_id, "user")})
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    role = user.get("role")
+    username = user.get("username")
+
+    tasks = []
+    dsus = []
+    attendance = []
+
+    if role == "intern":
+        intern_profile = await db.interns.find_one({"email": user.get("email")})
+        if intern_profile:
+            intern_id = str(intern_profile["_id"])
+            tasks = await db.tasks.find({"internId": intern_id}).sort("created_at", -1).limit(limit).to_list(None)
+            dsus = await db.dsu_entries.find({"internId": intern_id}, INTERN_REF_PROJECTION).sort("date", -1).limit(limit).to_list(None)
+
+    if role == "scrum_master":
+        dsus = await db.dsu_entries.find({"reviewedBy": username}, INTERN_REF_PROJECTION).sort("reviewedAt", -1).limit(limit).to_list(None)
+        attendance = await db.office_attendance.find({"markedBy": username}).sort("updatedAt", -1).limit(limit).to_list(None)
+
+    return {
+        "role": role,
+        "tasks": tasks,
+        "dsus": dsus,
+        "attendance": attendance
+    }
@@ -0,0 +1,593 @@
+"""
+Authentication routes: OTP registration, password login/registration,
+password reset and Azure SSO
+"""
+
+import hashlib
+import os
+import random
+import re
+import secrets
+from datetime import datetime, timezone, timedelta
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, EmailStr
+
+from database import get_database
+from auth import create_access_token, revoke_user_tokens
+from dashboard_counters import apply_set, record_change
+from logging_config import get_logger
+from utils.helpers import normalize_email
+from utils.security import hash_password_async, verify_password_async
+from utils.responses import FastJSONRoute
+from models import UserCreate, UserResponse, LoginRequest, Token
+
+ADMIN_EMAILS = [
+    "mukund.hs@cirruslabs.io",
+    "manjunatha.bhat@cirruslabs.io",
+    "karan.ry@cirruslabs.io"
+]
+
+RESET_SENDER_EMAIL = os.getenv("SENDER_MAIL")
+
+
+class ForgotPasswordRequest(BaseModel):
+    email: EmailStr
+
+
+class ResetPasswordRequest(BaseModel):
+    token: str
+    new_password: str
+    confirm_password: str
+
+
+async def get_graph_access_token() -> str:
+    import httpx
+
+    tenant_id = os.getenv("tenant_id")
+    client_id = os.getenv("client_id")
+    client_secret = os.getenv("AZURE_SECRET_KEY")
+
+    missing = []
+    if not tenant_id:
+        missing.append("tenant_id")
+    if not client_id:
+        missing.append("client_id")
+    if not client_secret:
+        missing.append("AZURE_SECRET_KEY")
+
+    if missing:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Microsoft Graph is not configured. Missing: {', '.join(missing)}"
+        )
+
+    token_url = f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
+    data = {
+        "client_id": client_id,
+        "client_secret": client_secret,
+        "scope": "https://graph.microsoft.com/.default",
+        "grant_type": "client_credentials"
+    }
+
+    async with httpx.AsyncClient() as client:
+        try:
+            resp = await client.post(token_url, data=data, timeout=30.0)
+        except httpx.ReadTimeout:
+            raise HTTPException(
+                status_code=503,
+                detail="Microsoft Graph token request timed out. Please try again."
+            )
+
+    if resp.status_code != 200:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Failed to get Graph access token: {resp.text}"
+        )
+
+    token = resp.json().get("access_token")
+    if not token:
+        raise HTTPException(status_code=503, detail="Missing Graph access token")
+
+    return token
+
+
+async def send_reset_email(to_email: str, reset_link: str) -> None:
+    import httpx
+
+    if not RESET_SENDER_EMAIL:
+        raise HTTPException(
+            status_code=503,
+            detail="SENDER_MAIL is not configured. Missing: SENDER_MAIL"
+        )
+    token = await get_graph_access_token()
+
+    subject = "Reset your Interns360 password"
+    body = (
+        "<p>Hello,</p>"
+        "<p>Click the link below to reset your password:</p>"
+        f"<p><a href=\"{reset_link}\">Reset password</a></p>"
+        "<p>If you did not request a reset, you can ignore this email.</p>"
+    )
+
+    payload = {
+        "message": {
+            "subject": subject,
+            "body": {
+                "contentType": "HTML",
+                "content": body
+            },
+            "toRecipients": [
+                {"emailAddress": {"address": to_email}}
+            ]
+        },
+        "saveToSentItems": "false"
+    }
+
+    send_url = f"https://graph.microsoft.com/v1.0/users/{RESET_SENDER_EMAIL}/sendMail"
+    async with httpx.AsyncClient() as client:
+        resp = await client.post(
+            send_url,
+            json=payload,
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=10.0
+        )
+
+    if resp.status_code not in [202]:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Failed to send reset email: {resp.text}"
+        )
+
+
+router = APIRouter(tags=["auth"], route_class=FastJSONRoute)
+
+OTP_TTL_MINUTES = 5
+
+
+# OTPs live in Mongo (TTL-indexed) so any worker can verify a code another issued
+@router.post("/api/auth/send-otp")
+async def send_otp_route(payload: dict, db=Depends(get_database)):
+    email = payload.get("email")
+
+    if not email:
+        raise HTTPException(status_code=400, detail="Email required")
+
+    otp = str(random.randint(100000, 999999))
+
+    await db.otp_codes.update_one(
+        {"_id": email},
+        {"$set": {"otp": otp, "expires_at": datetime.utcnow() + timedelta(minutes=OTP_TTL_MINUTES)}},
+        upsert=True
+    )
+
+    get_logger("otp").info("otp issued", extra={"email": email})
+    get_logger("otp").debug("dev otp", extra={"email": email, "otp": otp})
+
+    return {"message": "OTP sent successfully"}
+
+
+@router.post("/api/auth/register")
+async def register_with_otp(payload: dict, db=Depends(get_database)):
+
+    email = payload.get("email")
+    otp = payload.get("otp")
+    password = payload.get("password")
+
+    saved = await db.otp_codes.find_one({"_id": email})
+    if not saved:
+        raise HTTPException(status_code=400, detail="OTP not requested")
+
+    if datetime.utcnow() > saved["expires_at"]:
+        raise HTTPException(status_code=400, detail="OTP expired")
+
+    if otp != saved["otp"]:
+        raise HTTPException(status_code=400, detail="Invalid OTP")
+
+    await db.otp_codes.delete_one({"_id": email})
+
+
+    existing = await db.users.find_one({"email": email})
+    if existing:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    # Create user
+    user_doc = {
+        "name": payload.get("fullName"),
+        "email": email,
+        "hashed_password": await hash_password_async(password),
+        "role": "intern",
+        "is_active": True,
+        "is_approved": False,
+        "created_at": datetime.now(timezone.utc)
+    }
+
+    await db.users.insert_one(user_doc)
+    await record_change(db, "users", after=user_doc)
+
+    return {"message": "Registration successful"}
+
+
+@router.post("/api/v1/auth/login", response_model=Token)
+async def login(credentials: LoginRequest, db = Depends(get_database)):
+    """Login with email and password"""
+    
+    email = normalize_email(credentials.email)
+
+    user = await db.users.find_one({"email": email})
+
+    if not user or not await verify_password_async(credentials.password, user["hashed_password"]):
+        raise HTTPException(status_code=401, detail="Incorrect email or password")
+
+    if not user.get("is_active", True):
+        raise HTTPException(status_code=400, detail="Your account has been deactivated")
+
+  
+    if not user.get("is_approved", False) and user.get("role") != "admin":
+        raise HTTPException(
+            status_code=403,
+            detail="Your account is pending admin approval. Please wait for approval."
+        )
+
+    token = create_access_token(data={"sub": user["username"], "role": user["role"], "uid": str(user["_id"])})
+
+    user_response = UserResponse(
+        id=str(user["_id"]),
+        username=user["username"],
+        email=user["email"],
+        name=user["name"],
+        employee_id=user.get("employee_id"),
+        role=user["role"],
+        is_active=user.get("is_active", True),
+        is_approved=user.get("is_approved", False),
+        created_at=user.get("created_at", datetime.now(timezone.utc))
+    )
+
+    return {"access_token": token, "token_type": "bearer", "user": user_response}
+
+
+@router.post("/api/v1/auth/register", response_model=UserResponse, status_code=201)
+async def register(user_data: UserCreate, db = Depends(get_database)):
+    """Register new user - requires admin approval"""
+    # Normalize email to lowercase
+    email = normalize_email(user_data.email)
+    username = user_data.username.lower().strip()
+
+    existing = await db.users.find_one(
+        {"$or": [{"email": email}, {"username": username}]}
+    )
+
+    if existing:
+        raise HTTPException(status_code=400, detail="User with this email or username already exists")
+
+    # Check if this is an admin email (auto-approve with admin role)
+    is_admin = email in ADMIN_EMAILS
+    role = "admin" if is_admin else "intern"
+    is_approved = is_admin  # Admins are auto-approved
+
+    user_dict = {
+        "username": username,
+        "email": email,
+        "name": user_data.name,
+        "employee_id": user_data.employee_id,
+        "hashed_password": await hash_password_async(user_data.password),
+        "role": role,
+        "is_active": True,
+        "is_approved": is_approved,
+        "auth_provider": "password",
+        "created_at": datetime.now(timezone.utc),
+        "updated_at": datetime.now(timezone.utc)
+    }
+
+    result = await db.users.insert_one(user_dict)
+    await record_change(db, "users", after=user_dict)
+
+    return UserResponse(
+        id=str(result.inserted_id),
+        username=user_dict["username"],
+        email=user_dict["email"],
+        name=user_dict["name"],
+        employee_id=user_dict["employee_id"],
+        role=user_dict["role"],
+        is_active=True,
+        is_approved=is_approved
+    )
+
+
+@router.post("/api/v1/auth/forgot-password")
+async def forgot_password(payload: ForgotPasswordRequest, db = Depends(get_database)):
+    """Send password reset link to the provided email"""
+    email = normalize_email(payload.email)
+    user = await db.users.find_one({"email": email})
+    if not user:
+        raise HTTPException(status_code=404, detail="Email not found")
+
+    frontend_url = os.getenv("FRONTEND_URL")
+    if not frontend_url:
+        raise HTTPException(
+            status_code=503,
+            detail="FRONTEND_URL is not configured. Missing: FRONTEND_URL"
+        )
+    frontend_url = frontend_url.rstrip("/")
+    reset_token = secrets.token_urlsafe(32)
+    reset_token_hash = hashlib.sha256(reset_token.encode("utf-8")).hexdigest()
+    reset_expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+
+    await db.users.update_one(
+        {"_id": user["_id"]},
+        {
+            "$set": {
+                "reset_password_id": reset_token_hash,
+                "reset_password_expires_at": reset_expires_at,
+                "reset_password_used": False,
+                "updated_at": datetime.now(timezone.utc)
+            }
+        }
+    )
+
+    reset_link = f"{frontend_url}/forgot-password?token={quote(reset_token)}"
+
+    # Try to send email, but don't fail if it times out
+    try:
+        await send_reset_email(email, reset_link)
+        print(f"[ForgotPassword] Reset email sent to {email}")
+    except Exception as e:
+        print(f"[ForgotPassword] Email send failed: {type(e).__name__}: {str(e)}")
+        print(f"[ForgotPassword] Reset token saved. Manual reset link: {reset_link}")
+
+    return {"message": "Password reset email sent"}
+
+
+@router.post("/api/v1/auth/reset-password")
+async def reset_password(payload: ResetPasswordRequest, db = Depends(get_database)):
+    token = payload.token.strip() if payload.token else ""
+    if not token:
+        print("[ResetPassword] No token provided")
+        raise HTTPException(status_code=400, detail="Invalid or expired reset link")
+
+    token_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    print(f"[ResetPassword] Looking for token hash: {token_hash[:16]}...")
+    user = await db.users.find_one({"reset_password_id": token_hash})
+    if not user:
+        # Check if ANY user has a reset token to help debug
+        any_reset = await db.users.find_one({"reset_password_id": {"$exists": True, "$ne": None}})
+        if any_reset:
+            print(f"[ResetPassword] Token hash not found, but other reset tokens exist")
+        else:
+            print("[ResetPassword] Token hash not found, no reset tokens in database")
+        raise HTTPException(status_code=400, detail="Invalid or expired reset link")
+
+    if user.get("reset_password_used"):
+        print("[ResetPassword] Token already used")
+        raise HTTPException(status_code=400, detail="Reset link already used")
+
+    expires_at = user.get("reset_password_expires_at")
+    if not expires_at:
+        print("[ResetPassword] No expiry time set")
+        raise HTTPException(status_code=400, detail="Reset link has expired")
+    
+    # Handle timezone-naive datetime from database
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    
+    if expires_at < datetime.now(timezone.utc):
+        print(f"[ResetPassword] Token expired at: {expires_at}")
+        raise HTTPException(status_code=400, detail="Reset link has expired")
+
+    if payload.new_password != payload.confirm_password:
+        raise HTTPException(status_code=400, detail="Passwords do not match")
+
+    if len(payload.new_password) < 8:
+        raise HTTPException(status_code=400, detail="Password must be at least 8 characters")
+
+    if not re.search(r"[A-Z]", payload.new_password) or \
+       not re.search(r"[0-9]", payload.new_password) or \
+       not re.search(r"[!@#$%^&*]", payload.new_password):
+        raise HTTPException(
+            status_code=400,
+            detail="Password must contain uppercase, number, and special character"
+        )
+
+    hashed_password = await hash_password_async(payload.new_password)
+
+    await db.users.update_one(
+        {"_id": user["_id"]},
+        {
+            "$set": {
+                "hashed_password": hashed_password,
+                "reset_password_used": True,
+                "reset_password_id": None,
+                "reset_password_expires_at": None,
+                "updated_at": datetime.now(timezone.utc)
+            }
+        }
+    )
+
+    await revoke_user_tokens(db, user.get("username"))
+
+    return {"message": "Password reset successful"}
+
+
+@router.post("/api/v1/auth/sso/azure", response_model=Token)
+async def azure_sso(azure_token: dict, db = Depends(get_database)):
+    """
+    Azure SSO authentication endpoint.
+    Expects: { "access_token": "azure_token_string" }
+    """
+    from azure_auth import validate_azure_token, get_or_create_azure_user
+
+    if not azure_token.get("access_token"):
+        raise HTTPException(status_code=400, detail="Missing access_token")
+
+    # Validate Azure token and get user info
+    azure_user = await validate_azure_token(azure_token["access_token"])
+
+    # Get or create user in our database
+    user_doc = await get_or_create_azure_user(azure_user, db)
+
+    # Check if user is approved (admins are always approved)
+    if not user_doc.get("is_approved", False) and user_doc.get("role") != "admin":
+        raise HTTPException(
+            status_code=403,
+            detail="Your account is pending admin approval. Please wait for approval."
+        )
+
+    # Normalize role - convert any invalid roles to 'intern'
+    valid_roles = ["admin", "scrum_master", "intern"]
+    user_role = user_doc.get("role", "intern")
+    if user_role not in valid_roles:
+        user_role = "intern"
+        # Update the user's role in the database
+        await db.users.update_one(
+            {"_id": user_doc["_id"]},
+            {"$set": {"role": "intern"}}
+        )
+        await revoke_user_tokens(db, user_doc.get("username"))
+        await record_change(db, "users", user_doc, apply_set(user_doc, {"role": "intern"}))
+
+    # Create our own JWT token for the user
+    our_token = create_access_token(
+        data={"sub": user_doc["username"], "role": user_role, "uid": str(user_doc["_id"])}
+    )
+
+    # Prepare user response
+    user_response = UserResponse(
+        id=str(user_doc["_id"]),
+        username=user_doc["username"],
+        email=user_doc["email"],
+        name=user_doc.get("name", ""),
+        employee_id=user_doc.get("employee_id"),
+        role=user_role,
+        is_active=user_doc.get("is_active", True),
+        is_approved=user_doc.get("is_approved", False),
+        created_at=user_doc.get("created_at", datetime.now(timezone.utc))
+    )
+
+    return {
+        "access_token": our_token,
+        "token_type": "bearer",
+        "user": user_response
+    }
+
+
+@router.post("/api/v1/auth/sso/azure/callback", response_model=Token)
+async def azure_sso_callback(request: dict, db = Depends(get_database)):
+    """
+    Handle Azure SSO callback with authorization code.
+    Expects: { "code": "authorization_code_from_azure" }
+    
+    Note: In production, exchange the code for a token on the backend.
+    For now, we expect the frontend to send us the token after getting it.
+    """
+    import httpx
+
+    code = request.get("code")
+    if not code:
+        raise HTTPException(status_code=400, detail="Missing authorization code")
+    
+    try:
+        # Exchange authorization code for token
+        tenant_id = os.getenv("tenant_id")
+        client_id = os.getenv("client_id")
+        secret_key = os.getenv("AZURE_SECRET_KEY")
+        redirect_uri = os.getenv("AZURE_REDIRECT_URI")
+        
+        print(f"[Azure SSO] tenant_id: {tenant_id}")
+        print(f"[Azure SSO] client_id: {client_id}")
+        print(f"[Azure SSO] secret_key present: {bool(secret_key)}")
+        print(f"[Azure SSO] redirect_uri: {redirect_uri}")
+        
+        if not all([tenant_id, client_id, secret_key]):
+            missing = []
+            if not tenant_id: missing.append("tenant_id")
+            if not client_id: missing.append("client_id")
+            if not secret_key: missing.append("AZURE_SECRET_KEY")
+            raise HTTPException(status_code=500, detail=f"Azure configuration incomplete. Missing: {', '.join(missing)}")
+        
+        async with httpx.AsyncClient() as client:
+            token_response = await client.post(
+                f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token",
+                data={
+                    "client_id": client_id,
+                    "client_secret": secret_key,
+                    "code": code,
+                    "redirect_uri": redirect_uri,
+                    "grant_type": "authorization_code",
+                    "scope": "User.Read openid profile email"
+                },
+                timeout=10.0
+            )
+            
+            if token_response.status_code != 200:
+                error_text = token_response.text
+                print(f"[Azure SSO] Token exchange error: {error_text}")
+                print(f"[Azure SSO] Status code: {token_response.status_code}")
+                print(f"[Azure SSO] Redirect URI used: {os.getenv('AZURE_REDIRECT_URI')}")
+                try:
+                    error_data = token_response.json()
+                    print(f"[Azure SSO] Error response: {error_data}")
+                except:
+                    pass
+                raise HTTPException(status_code=401, detail=f"Failed to exchange code for token: {error_text}")
+            
+            token_data = token_response.json()
+            access_token = token_data.get("access_token")
+            
+            if not access_token:
+                raise HTTPException(status_code=401, detail="No access token in response")
+        
+        # Validate token and get/create user
+        from azure_auth import validate_azure_token, get_or_create_azure_user
+
+        azure_user = await validate_azure_token(access_token)
+        user_doc = await get_or_create_azure_user(azure_user, db)
+
+        # Check if user is approved (admins are always approved)
+        if not user_doc.get("is_approved", False) and user_doc.get("role") != "admin":
+            raise HTTPException(
+                status_code=403,
+                detail="Your account is pending admin approval. Please wait for approval."
+            )
+
+        # Create our JWT token
+        # Normalize role - convert any invalid roles to 'intern'
+        valid_roles = ["admin", "scrum_master", "intern"]
+        user_role = user_doc.get("role", "intern")
+        if user_role not in valid_roles:
+            user_role = "intern"
+            # Update the user's role in the database
+            await db.users.update_one(
+                {"_id": user_doc["_id"]},
+                {"$set": {"role": "intern"}}
+            )
+            await revoke_user_tokens(db, user_doc.get("username"))
+            await record_change(db, "users", user_doc, apply_set(user_doc, {"role": "intern"}))
+
+        our_token = create_access_token(
+            data={"sub": user_doc["username"], "role": user_role, "uid": str(user_doc["_id"])}
+        )
+
+        user_response = UserResponse(
+            id=str(user_doc["_id"]),
+            username=user_doc["username"],
+            email=user_doc["email"],
+            name=user_doc.get("name", ""),
+            employee_id=user_doc.get("employee_id"),
+            role=user_role,
+            is_active=user_doc.get("is_active", True),
+            is_approved=user_doc.get("is_approved", False),
+            created_at=user_doc.get("created_at", datetime.now(timezone.utc))
+        )
+
+        return {
+            "access_token": our_token,
+            "token_type": "bearer",
+            "user": user_response
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Azure callback error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Authentication failed: {str(e)}")
@@ -0,0 +1,515 @@
+"""
+Batch and organization routes
+"""
+
+from datetime import datetime, date, timezone, timedelta
+from typing import Optional, List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Body
+from pymongo import ReturnDocument
+from pydantic import BaseModel
+
+from database import get_database
+from auth import get_current_active_user, get_admin_user
+from dashboard_counters import apply_set, record_change
+from utils.helpers import parse_date, parse_object_id
+from utils.fields import FIELDS_DESCRIPTION, INTERN_FIELDS, INTERN_SUMMARY_FIELDS, projection_for
+from utils.responses import FastJSONRoute
+from models import User, BatchCreate, BatchUpdate
+
+class OrganizationCreate(BaseModel):
+    name: str
+
+
+router = APIRouter(tags=["batches"], route_class=FastJSONRoute)
+
+
+# ==================== BATCH ROUTES ====================
+@router.post("/api/v1/batches/", status_code=201)
+async def create_batch(
+    batch_data: BatchCreate,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Create a new batch"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+   
+    batch_name_slug = batch_data.batchName.lower().replace(" ", "_").replace("-", "_")
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    generated_batch_id = f"{batch_name_slug}_{timestamp}"
+    
+  
+    existing = await db.batches.find_one({"batchId": generated_batch_id})
+    if existing:
+     
+        import random
+        generated_batch_id = f"{generated_batch_id}_{random.randint(1000, 9999)}"
+    
+   
+    start_date = parse_date(batch_data.startDate)
+    today = date.today()
+    
+   
+    default_duration = 90
+    end_date = start_date + timedelta(days=default_duration)
+    
+    if start_date > today:
+        status = "upcoming"
+    elif end_date < today:
+        status = "completed"
+    else:
+        status = "active"
+    
+    batch_dict = batch_data.model_dump()
+    batch_dict["batchId"] = generated_batch_id
+    # Convert dates to datetime 
+    batch_dict["startDate"] = datetime.combine(start_date, datetime.min.time())
+    batch_dict["endDate"] = datetime.combine(end_date, datetime.min.time())
+    batch_dict["duration"] = default_duration
+    if not batch_dict.get("maxInterns"):
+        batch_dict["maxInterns"] = 50
+    batch_dict["status"] = status
+    batch_dict["internIds"] = []
+    batch_dict["totalInterns"] = 0
+    batch_dict["activeInterns"] = 0
+    batch_dict["completedInterns"] = 0
+    batch_dict["droppedInterns"] = 0
+    batch_dict["averageRating"] = 0.0
+    batch_dict["averageTaskCompletion"] = 0.0
+    batch_dict["averageDSUStreak"] = 0
+    batch_dict["created_at"] = datetime.now(timezone.utc)
+    batch_dict["updated_at"] = datetime.now(timezone.utc)
+    batch_dict["createdBy"] = current_user.username
+    
+    result = await db.batches.insert_one(batch_dict)
+    await record_change(db, "batches", after=batch_dict)
+    batch_dict["_id"] = str(result.inserted_id)
+    
+    return batch_dict
+
+
+@router.get("/api/v1/batches/")
+async def list_batches(
+    status: Optional[str] = Query(None),
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """List all batches with stats - Optimized with aggregation pipeline"""
+    match_stage = {}
+    if status:
+        match_stage["status"] = status
+    
+ 
+    pipeline = [
+        {"$match": match_stage} if match_stage else {"$match": {}},
+        {"$sort": {"startDate": -1}},
+        # Lookup year
+        {
+            "$lookup": {
+                "from": "batch_years",
+                "let": {"yearIdStr": "$yearId"},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": [{"$toString": "$_id"}, "$$yearIdStr"]}}},
+                    {"$project": {"label": 1, "year": 1}}
+                ],
+                "as": "yearDetails"
+            }
+        },
+        
+        {
+            "$lookup": {
+                "from": "batch_months",
+                "let": {"monthIdStr": "$monthId"},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": [{"$toString": "$_id"}, "$$monthIdStr"]}}},
+                    {"$project": {"name": 1}}
+                ],
+                "as": "monthDetails"
+            }
+        },
+        
+        {
+            "$lookup": {
+                "from": "organizations",
+                "let": {"orgIdStr": "$organizationId"},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": [{"$toString": "$_id"}, "$$orgIdStr"]}}},
+                    {"$project": {"name": 1}}
+                ],
+                "as": "orgDetails"
+            }
+        },
+        
+        {
+            "$lookup": {
+                "from": "interns",
+                "let": {"batchId": "$batchId"},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$batch", "$$batchId"]}}},
+                    {
+                        "$group": {
+                            "_id": "$status",
+                            "count": {"$sum": 1}
+                        }
+                    }
+                ],
+                "as": "internStats"
+            }
+        },
+        
+        {
+            "$addFields": {
+                "year": {
+                    "$ifNull": [
+                        {"$arrayElemAt": ["$yearDetails.label", 0]},
+                        {"$toString": {"$arrayElemAt": ["$yearDetails.year", 0]}}
+                    ]
+                },
+                "month": {"$arrayElemAt": ["$monthDetails.name", 0]},
+                "organization": {"$arrayElemAt": ["$orgDetails.name", 0]},
+                "totalInterns": {
+                    "$sum": "$internStats.count"
+                },
+                "activeInterns": {
+                    "$let": {
+                        "vars": {
+                            "activeStats": {
+                                "$filter": {
+                                    "input": "$internStats",
+                                    "as": "stat",
+                                    "cond": {"$eq": ["$$stat._id", "active"]}
+                                }
+                            }
+                        },
+                        "in": {"$ifNull": [{"$arrayElemAt": ["$$activeStats.count", 0]}, 0]}
+                    }
+                },
+                "completedInterns": {
+                    "$let": {
+                        "vars": {
+                            "completedStats": {
+                                "$filter": {
+                                    "input": "$internStats",
+                                    "as": "stat",
+                                    "cond": {"$eq": ["$$stat._id", "completed"]}
+                                }
+                            }
+                        },
+                        "in": {"$ifNull": [{"$arrayElemAt": ["$$completedStats.count", 0]}, 0]}
+                    }
+                },
+                "droppedInterns": {
+                    "$let": {
+                        "vars": {
+                            "droppedStats": {
+                                "$filter": {
+                                    "input": "$internStats",
+                                    "as": "stat",
+                                    "cond": {"$eq": ["$$stat._id", "dropped"]}
+                                }
+                            }
+                        },
+                        "in": {"$ifNull": [{"$arrayElemAt": ["$$droppedStats.count", 0]}, 0]}
+                    }
+                },
+                "averageTaskCompletion": {"$ifNull": ["$averageTaskCompletion", 0.0]}
+            }
+        },
+        
+        {"$project": {"yearDetails": 0, "monthDetails": 0, "orgDetails": 0, "internStats": 0}}
+    ]
+    
+    batches = []
+    async for batch in db.batches.aggregate(pipeline):
+        # Convert date objects to datetime 
+        if isinstance(batch.get("startDate"), date) and not isinstance(batch.get("startDate"), datetime):
+            batch["startDate"] = datetime.combine(batch["startDate"], datetime.min.time())
+        if isinstance(batch.get("endDate"), date) and not isinstance(batch.get("endDate"), datetime):
+            batch["endDate"] = datetime.combine(batch["endDate"], datetime.min.time())
+        
+        batches.append(batch)
+    
+    return batches
+
+
+@router.get("/api/v1/batches/{batch_id}")
+async def get_batch(
+    batch_id: str,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get batch by ID with intern details"""
+    # Try to find by MongoDB _id first, then by batchId
+    try:
+        batch = await db.batches.find_one({"_id": parse_object_id(batch_id, "batch")})
+    except HTTPException:
+        batch = await db.batches.find_one({"batchId": batch_id})
+    
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    
+    batch["_id"] = str(batch["_id"])
+    if batch.get("yearId"):
+        try:
+            year_doc = await db.batch_years.find_one({"_id": parse_object_id(batch["yearId"], "batch year")})
+            if year_doc:
+                batch["year"] = year_doc.get("label") or str(year_doc.get("year"))
+        except HTTPException:
+            pass
+    if batch.get("monthId"):
+        try:
+            month_doc = await db.batch_months.find_one({"_id": parse_object_id(batch["monthId"], "batch month")})
+            if month_doc:
+                batch["month"] = month_doc.get("name")
+        except HTTPException:
+            pass
+    if batch.get("organizationId"):
+        try:
+            org_doc = await db.organizations.find_one({"_id": parse_object_id(batch["organizationId"], "organization")})
+            if org_doc:
+                batch["organization"] = org_doc.get("name")
+        except HTTPException:
+            pass
+    
+    
+    interns = await db.interns.find({"batch": batch_id}).sort("name", 1).to_list(None)
+    
+    batch["interns"] = interns
+    batch["totalInterns"] = len(interns)
+    batch["activeInterns"] = len([i for i in interns if i["status"] == "active"])
+    batch["completedInterns"] = len([i for i in interns if i["status"] == "completed"])
+    batch["droppedInterns"] = len([i for i in interns if i["status"] == "dropped"])
+    
+    
+    if interns:
+        avg_completion = sum(i.get("completedTasks", 0) / max(i.get("taskCount", 1), 1) * 100 for i in interns) / len(interns)
+        avg_streak = sum(i.get("dsuStreak", 0) for i in interns) / len(interns)
+        batch["averageTaskCompletion"] = round(avg_completion, 2)
+        batch["averageDSUStreak"] = round(avg_streak, 1)
+    
+    return batch
+
+
+@router.patch("/api/v1/batches/{batch_id}")
+async def update_batch(
+    batch_id: str,
+    batch_update: BatchUpdate,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Update batch"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    batch = await db.batches.find_one({"batchId": batch_id})
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    
+    update_data = batch_update.model_dump(exclude_unset=True)
+    update_data["updated_at"] = datetime.now(timezone.utc)
+
+    if "yearId" in update_data and update_data["yearId"]:
+        year = await db.batch_years.find_one({"_id": parse_object_id(update_data["yearId"], "batch year")})
+        if not year:
+            raise HTTPException(status_code=404, detail="Batch year not found")
+    if "monthId" in update_data and update_data["monthId"]:
+        month = await db.batch_months.find_one({"_id": parse_object_id(update_data["monthId"], "batch month")})
+        if not month:
+            raise HTTPException(status_code=404, detail="Batch month not found")
+    if "organizationId" in update_data and update_data["organizationId"]:
+        org = await db.organizations.find_one({"_id": parse_object_id(update_data["organizationId"], "organization")})
+        if not org:
+            raise HTTPException(status_code=404, detail="Organization not found")
+    
+    before = await db.batches.find_one_and_update(
+        {"batchId": batch_id},
+        {"$set": update_data},
+        return_document=ReturnDocument.BEFORE
+    )
+    if not before:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    
+    result = apply_set(before, update_data)
+    await record_change(db, "batches", before, result)
+    
+    result["_id"] = str(result["_id"])
+    return result
+
+
+@router.delete("/api/v1/batches/{batch_id}", status_code=204)
+async def delete_batch(
+    batch_id: str,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Delete batch (only if no interns)"""
+    if current_user.role not in ["admin"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+   
+    intern_count = await db.interns.count_documents({"batch": batch_id})
+    if intern_count > 0:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot delete batch with {intern_count} interns. Remove interns first."
+        )
+    
+    deleted = await db.batches.find_one_and_delete({"batchId": batch_id})
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    await record_change(db, "batches", before=deleted)
+    
+    return None
+
+
+@router.get("/api/v1/batches/{batch_id}/interns")
+async def get_batch_interns(
+    batch_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get all interns in a batch"""
+    projection = projection_for(fields, INTERN_FIELDS, INTERN_SUMMARY_FIELDS)
+    return await db.interns.find({"batch": batch_id}, projection).sort("name", 1).to_list(None)
+
+
+@router.post("/api/v1/batches/{batch_id}/users", status_code=200)
+async def add_users_to_batch(
+    batch_id: str,
+    user_ids: List[str] = Body(...),
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Add interns or scrum masters to a batch"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    # Verify batch exists - try by batchId first, then by _id
+    batch = await db.batches.find_one({"batchId": batch_id})
+    if not batch:
+        try:
+            batch = await db.batches.find_one({"_id": parse_object_id(batch_id, "batch")})
+            if batch:
+                
+                batch_id = batch["batchId"]
+        except HTTPException:
+            pass
+    
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    
+    added_users = []
+    failed_users = []
+    
+    for user_id in user_ids:
+        try:
+            # Check if user exists in any user collection
+            user = await db.users.find_one({"_id": parse_object_id(user_id, "user")})
+            
+            if not user:
+                failed_users.append({"id": user_id, "reason": "User not found"})
+                continue
+            
+            
+            await db.users.update_one(
+                {"_id": parse_object_id(user_id, "user")},
+                {
+                    "$set": {
+                        "batch": batch_id,
+                        "updated_at": datetime.now(timezone.utc)
+                    }
+                }
+            )
+            
+            
+            if user_id not in batch.get("internIds", []):
+                await db.batches.update_one(
+                    {"batchId": batch_id},
+                    {
+                        "$addToSet": {"internIds": user_id},
+                        "$set": {"updated_at": datetime.now(timezone.utc)}
+                    }
+                )
+            
+            added_users.append({
+                "id": user_id,
+                "name": user.get("name", "Unknown"),
+                "role": user.get("role", "intern")
+            })
+            
+        except Exception as e:
+            failed_users.append({"id": user_id, "reason": str(e)})
+    
+    return {
+        "message": f"Added {len(added_users)} users to batch {batch_id}",
+        "added": added_users,
+        "failed": failed_users
+    }
+
+
+@router.delete("/api/v1/batches/{batch_id}/users/{user_id}", status_code=200)
+async def remove_user_from_batch(
+    batch_id: str,
+    user_id: str,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Remove a user from a batch"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    # Verify batch exists
+    batch = await db.batches.find_one({"batchId": batch_id})
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    await db.users.update_one(
+        {"_id": parse_object_id(user_id, "user")},
+        {
+            "$set": {
+                "batch": None,
+                "updated_at": datetime.now(timezone.utc)
+            }
+        }
+    )
+    
+    
+    await db.batches.update_one(
+        {"batchId": batch_id},
+        {
+            "$pull": {"internIds": user_id},
+            "$set": {"updated_at": datetime.now(timezone.utc)}
+        }
+    )
+    
+    return {"message": f"User {user_id} removed from batch {batch_id}"}
+
+
+# ==================== ORGANIZATION ROUTES ====================
+@router.get("/api/v1/organizations/")
+async def list_organizations(
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    return await db.organizations.find().sort("name", 1).to_list(None)
+
+
+@router.post("/api/v1/organizations/", status_code=201)
+async def create_organization(
+    payload: OrganizationCreate,
+    db = Depends(get_database),
+    admin: User = Depends(get_admin_user)
+):
+    existing = await db.organizations.find_one({"name": payload.name})
+    if existing:
+        raise HTTPException(status_code=400, detail="Organization already exists")
+
+    data = payload.model_dump()
+    data["created_at"] = datetime.now(timezone.utc)
+    data["updated_at"] = datetime.now(timezone.utc)
+    result = await db.organizations.insert_one(data)
+    data["_id"] = str(result.inserted_id)
+    return data
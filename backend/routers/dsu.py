@@ -0,0 +1,416 @@
+"""
+Daily stand-up (DSU) and office attendance routes
+"""
+
+import asyncio
+from datetime import datetime, date, timezone
+from typing import Optional
+
+from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pymongo import DESCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from database import get_analytics_database, get_database
+from auth import get_current_active_user, get_token_principal, TokenPrincipal
+from dashboard_counters import apply_set, record_change, record_changes
+from indexes import DSU_UNIQUE_KEYS, has_unique_index
+from intern_refs import (
+    INTERN_REF_FIELD, INTERN_REF_PROJECTION, attach_interns, intern_lookup, intern_oid, load_interns,
+    strip_intern_ref, with_intern_ref
+)
+from models import User, DSUBulkCreate, DSUCreate, DSUUpdate, OfficeAttendanceCreate
+from utils.export import EXPORT_FORMAT_DESCRIPTION, ExportFormat, export_response
+from utils.fields import FIELDS_DESCRIPTION, projection_for
+from utils.pagination import TOTAL_DESCRIPTION, TotalMode, aggregate_page, page_query, sort_stage, with_total
+from utils.responses import FastJSONRoute
+
+
+router = APIRouter(tags=["dsu"], route_class=FastJSONRoute)
+
+DSU_SORT = [("date", DESCENDING), ("_id", DESCENDING)]
+DUPLICATE_KEY = 11000
+ATTENDANCE_FIELDS = frozenset({"internId", "date", "status", "remarks", "markedBy", "updatedAt", "createdAt"})
+ATTENDANCE_SUMMARY_FIELDS = ("internId", "date", "status", "markedBy", "updatedAt")
+DSU_EXPORT_COLUMNS = (
+    "_id", "internId", "internName", "batch", "date", "yesterday", "today", "blockers", "learnings",
+    "status", "submittedAt", "reviewedBy", "reviewedAt", "feedback",
+)
+ATTENDANCE_EXPORT_COLUMNS = ("_id", "internId", "internName", "date", "status", "remarks", "markedBy", "createdAt", "updatedAt")
+
+
+# ==================== DSU ROUTES ====================
+@router.post("/api/v1/dsu-entries/", status_code=201)
+async def create_dsu(
+    dsu_data: DSUCreate,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Create DSU entry"""
+    existing = await db.dsu_entries.find_one({
+        "internId": dsu_data.internId,
+        "date": dsu_data.date.isoformat()
+    })
+    
+    if existing:
+        raise HTTPException(status_code=400, detail="DSU already exists for this date")
+    
+    dsu_dict = dsu_data.model_dump()
+    dsu_dict["date"] = dsu_data.date.isoformat()
+    dsu_dict["status"] = "submitted"
+    submitted_at = datetime.now(timezone.utc)
+    dsu_dict["submittedAt"] = submitted_at
+    dsu_dict["created_at"] = datetime.now(timezone.utc)
+    dsu_dict["updated_at"] = datetime.now(timezone.utc)
+    
+    try:
+        result = await db.dsu_entries.insert_one(with_intern_ref(dsu_dict))
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="DSU already exists for this date")
+    await record_change(db, "dsu_entries", after=dsu_dict)
+    
+    # Update intern's DSU streak
+    await db.interns.update_one(
+        {"_id": ObjectId(dsu_data.internId)},
+        {"$inc": {"dsuStreak": 1}}
+    )
+    
+    dsu_dict["_id"] = str(result.inserted_id)
+    return strip_intern_ref(dsu_dict)
+
+
+async def dsu_filter(
+    db,
+    intern_id: Optional[str],
+    batch: Optional[str],
+    date_from: Optional[date],
+    date_to: Optional[date]
+) -> dict:
+    """Query for the DSU list/export filters"""
+    match_stage = {}
+    
+    if intern_id:
+        match_stage["internId"] = intern_id
+    
+    if batch:
+      
+        intern_ids = []
+        async for intern in db.interns.find({"batch": batch}, {"_id": 1}):
+            intern_ids.append(str(intern["_id"]))
+        match_stage["internId"] = {"$in": intern_ids}
+    
+    if date_from or date_to:
+        match_stage["date"] = {}
+        if date_from:
+            match_stage["date"]["$gte"] = str(date_from)
+        if date_to:
+            match_stage["date"]["$lte"] = str(date_to)
+    
+    return match_stage
+
+
+@router.post("/api/v1/dsu-entries/bulk")
+async def create_dsu_bulk(
+    bulk_data: DSUBulkCreate,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Create many DSU entries (admin/scrum master), e.g. a backfill or a whole
+    team. Duplicates are rejected by the unique (internId, date) index, so
+    one unordered insert_many stores every other entry; results are per item.
+    Until that index is confirmed, existing pairs are looked up with one query.
+    """
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    interns, indexed = await asyncio.gather(
+        load_interns(db, {entry.internId for entry in bulk_data.entries}),
+        has_unique_index(db, "dsu_entries", DSU_UNIQUE_KEYS)
+    )
+    existing = set()
+    if not indexed:
+        async for dsu in db.dsu_entries.find(
+            {
+                "internId": {"$in": list({entry.internId for entry in bulk_data.entries})},
+                "date": {"$in": list({entry.date.isoformat() for entry in bulk_data.entries})}
+            },
+            {"_id": 0, "internId": 1, "date": 1}
+        ):
+            existing.add((dsu.get("internId"), dsu.get("date")))
+
+    now = datetime.now(timezone.utc)
+    results = [None] * len(bulk_data.entries)
+    docs, positions = [], []
+    for index, entry in enumerate(bulk_data.entries):
+        oid = intern_oid(entry.internId)
+        if oid is None or str(oid) not in interns:
+            results[index] = {"index": index, "status": "invalid", "detail": "Intern not found"}
+            continue
+        pair = (entry.internId, entry.date.isoformat())
+        if pair in existing:
+            results[index] = {"index": index, "status": "duplicate", "detail": "DSU already exists for this date"}
+            continue
+        existing.add(pair)  # Repeated within this request
+        dsu_dict = entry.model_dump()
+        dsu_dict["date"] = entry.date.isoformat()
+        dsu_dict["status"] = "submitted"
+        dsu_dict["submittedAt"] = now
+        dsu_dict["created_at"] = now
+        dsu_dict["updated_at"] = now
+        docs.append(with_intern_ref(dsu_dict))
+        positions.append(index)
+
+    failed = {}
+    if docs:
+        try:
+            await db.dsu_entries.insert_many(docs, ordered=False)
+        except BulkWriteError as exc:
+            failed = {error["index"]: error for error in exc.details.get("writeErrors", [])}
+
+    inserted, streaks = [], {}
+    for position, (index, doc) in enumerate(zip(positions, docs)):
+        error = failed.get(position)
+        if error is None:
+            inserted.append(doc)
+            streaks[doc[INTERN_REF_FIELD]] = streaks.get(doc[INTERN_REF_FIELD], 0) + 1
+            results[index] = {"index": index, "status": "created", "_id": doc["_id"]}
+        elif error.get("code") == DUPLICATE_KEY:
+            results[index] = {"index": index, "status": "duplicate", "detail": "DSU already exists for this date"}
+        else:
+            results[index] = {"index": index, "status": "error", "detail": error.get("errmsg", "Insert failed")}
+
+    if streaks:
+        await db.interns.bulk_write(
+            [UpdateOne({"_id": oid}, {"$inc": {"dsuStreak": count}}) for oid, count in streaks.items()],
+            ordered=False
+        )
+    await record_changes(db, "dsu_entries", [(None, doc) for doc in inserted])
+
+    statuses = [result["status"] for result in results]
+    return {
+        "created": statuses.count("created"),
+        "duplicates": statuses.count("duplicate"),
+        "failed": len(statuses) - statuses.count("created") - statuses.count("duplicate"),
+        "results": results
+    }
+
+
+@router.get("/api/v1/dsu-entries/")
+async def list_dsu_entries(
+    intern_id: Optional[str] = Query(None),
+    batch: Optional[str] = Query(None),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="nextCursor of the previous page (instead of skip)"),
+    total: TotalMode = Query("exact", description=TOTAL_DESCRIPTION),
+    db = Depends(get_database),
+    current_user: TokenPrincipal = Depends(get_token_principal)
+):
+    """List DSU entries with filters - Optimized with aggregation pipeline"""
+    match_stage = await dsu_filter(db, intern_id, batch, date_from, date_to)
+    
+    # Use aggregation pipeline with $lookup to join intern data in single query
+    pipeline = [
+        {"$match": page_query(match_stage, DSU_SORT, cursor, skip)},
+        sort_stage(DSU_SORT),
+        {"$skip": skip},
+        {"$limit": limit + 1},
+        *intern_lookup(["name", "batch"]),
+        {
+            "$addFields": {
+                "internName": {
+                    "$ifNull": [
+                        {"$arrayElemAt": ["$internDetails.name", 0]},
+                        "Unknown"
+                    ]
+                },
+                "batch": {
+                    "$ifNull": [
+                        {"$arrayElemAt": ["$internDetails.batch", 0]},
+                        "$batch"
+                    ]
+                }
+            }
+        },
+        {"$project": {"internDetails": 0, **INTERN_REF_PROJECTION}}
+    ]
+    
+    # Page and total count (reusing the match stage) run concurrently
+    (entries, next_cursor), total_count = await with_total(
+        aggregate_page(db.dsu_entries, pipeline, limit, DSU_SORT), db.dsu_entries, match_stage, total
+    )
+    return {
+        "items": entries,
+        "total": total_count,
+        "skip": skip,
+        "limit": limit,
+        "nextCursor": next_cursor
+    }
+
+
+@router.get("/api/v1/dsu-entries/export")
+async def export_dsu_entries(
+    format: ExportFormat = Query("ndjson", description=EXPORT_FORMAT_DESCRIPTION),
+    intern_id: Optional[str] = Query(None),
+    batch: Optional[str] = Query(None),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    db = Depends(get_analytics_database),
+    current_user: TokenPrincipal = Depends(get_token_principal)
+):
+    """Stream DSU entries matching the list filters as NDJSON or CSV (admin/scrum master)"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    query = await dsu_filter(db, intern_id, batch, date_from, date_to)
+    cursor = db.dsu_entries.find(query, INTERN_REF_PROJECTION).sort(DSU_SORT)
+
+    async def enrich(entries):
+        stored = [entry.get("batch") for entry in entries]
+        await attach_interns(
+            db, entries, {"internName": ("name", "Unknown"), "batch": ("batch", None)},
+            unresolved={"internName": "Unknown"}
+        )
+        # Same as the list's $ifNull: the intern's value, else the entry's batch / "Unknown"
+        for entry, batch in zip(entries, stored):
+            if entry.get("batch") is None:
+                entry["batch"] = batch
+            if entry.get("internName") is None:
+                entry["internName"] = "Unknown"
+
+    return export_response(cursor, format, "dsu-entries", DSU_EXPORT_COLUMNS, enrich)
+
+
+@router.patch("/api/v1/dsu-entries/{entry_id}")
+async def update_dsu(
+    entry_id: str,
+    dsu_update: DSUUpdate,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Update DSU entry"""
+    update_data = dsu_update.model_dump(exclude_unset=True)
+    if not update_data:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    
+    if "feedback" in update_data and current_user.role in ["admin", "scrum_master"]:
+        update_data["reviewedBy"] = current_user.username
+        update_data["reviewedAt"] = datetime.now(timezone.utc)
+        update_data["status"] = "reviewed"
+    
+    update_data["updated_at"] = datetime.now(timezone.utc)
+    
+    before = await db.dsu_entries.find_one_and_update(
+        {"_id": ObjectId(entry_id)},
+        {"$set": update_data},
+        projection=INTERN_REF_PROJECTION,
+        return_document=ReturnDocument.BEFORE
+    )
+    
+    if not before:
+        raise HTTPException(status_code=404, detail="DSU entry not found")
+    
+    result = apply_set(before, update_data)
+    await record_change(db, "dsu_entries", before, result)
+    
+    result["_id"] = str(result["_id"])
+    return result
+
+
+# ==================== OFFICE ATTENDANCE ROUTES ====================
+@router.post("/api/v1/office-attendance", status_code=201)
+async def upsert_office_attendance(
+    attendance_data: OfficeAttendanceCreate,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Mark office attendance (admin/scrum master)"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    date_value = attendance_data.date
+    date_key = date_value.isoformat() if isinstance(date_value, date) else str(date_value)
+
+    filter_query = {
+        "internId": attendance_data.internId,
+        "date": date_key
+    }
+
+    update_data = {
+        "status": attendance_data.status,
+        "remarks": attendance_data.remarks,
+        "markedBy": current_user.username,
+        "updatedAt": datetime.now(timezone.utc)
+    }
+
+    result = await db.office_attendance.update_one(
+        filter_query,
+        {
+            "$set": update_data,
+            "$setOnInsert": {
+                "internId": attendance_data.internId,
+                "date": date_key,
+                "createdAt": datetime.now(timezone.utc)
+            }
+        },
+        upsert=True
+    )
+
+    stored = await db.office_attendance.find_one(filter_query)
+    if not stored and result.upserted_id:
+        stored = await db.office_attendance.find_one({"_id": result.upserted_id})
+
+    if not stored:
+        raise HTTPException(status_code=500, detail="Failed to save attendance")
+
+    stored["_id"] = str(stored["_id"])
+    return stored
+
+
+def attendance_filter(day: Optional[date], intern_id: Optional[str]) -> dict:
+    query = {}
+    if day:
+        query["date"] = day.isoformat()
+    if intern_id:
+        query["internId"] = intern_id
+    return query
+
+
+@router.get("/api/v1/office-attendance")
+async def list_office_attendance(
+    date: Optional[date] = Query(None),
+    intern_id: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """List office attendance records (admin/scrum master)"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    query = attendance_filter(date, intern_id)
+    projection = projection_for(fields, ATTENDANCE_FIELDS, ATTENDANCE_SUMMARY_FIELDS)
+    return await db.office_attendance.find(query, projection).sort("updatedAt", -1).to_list(None)
+
+
+@router.get("/api/v1/office-attendance/export")
+async def export_office_attendance(
+    format: ExportFormat = Query("ndjson", description=EXPORT_FORMAT_DESCRIPTION),
+    date: Optional[date] = Query(None),
+    intern_id: Optional[str] = Query(None),
+    db = Depends(get_analytics_database),
+    current_user: TokenPrincipal = Depends(get_token_principal)
+):
+    """Stream office attendance records as NDJSON or CSV (admin/scrum master)"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    cursor = db.office_attendance.find(attendance_filter(date, intern_id)).sort("updatedAt", -1)
+
+    async def enrich(records):
+        await attach_interns(db, records, {"internName": ("name", "Unknown")}, unresolved={"internName": "Unknown"})
+
+    return export_response(cursor, format, "office-attendance", ATTENDANCE_EXPORT_COLUMNS, enrich)
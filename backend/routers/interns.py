@@ -0,0 +1,260 @@
+"""
+Intern profile routes
+"""
+
+from datetime import datetime, date, timezone
+from typing import Optional
+
+from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pymongo import ASCENDING, ReturnDocument
+
+from database import get_database
+from auth import get_current_active_user, get_admin_user, get_token_principal, TokenPrincipal
+from dashboard_counters import apply_set, record_change
+from intern_refs import forget_intern
+from models import User, InternCreate, InternUpdate
+from utils.fields import FIELDS_DESCRIPTION, INTERN_FIELDS, INTERN_SUMMARY_FIELDS, projection_for
+from utils.pagination import TOTAL_DESCRIPTION, TotalMode, find_page, with_total
+from utils.responses import FastJSONRoute
+
+
+router = APIRouter(tags=["interns"], route_class=FastJSONRoute)
+
+# Insertion order, so skip-based pages are stable
+INTERN_SORT = [("_id", ASCENDING)]
+
+
+# ==================== INTERN ROUTES ====================
+@router.post("/api/v1/interns/", status_code=201)
+async def create_intern(
+    intern_data: InternCreate,
+    db = Depends(get_database),
+    admin: User = Depends(get_admin_user)
+):
+    """Create new intern (admin only)"""
+    existing = await db.interns.find_one({"email": intern_data.email})
+    if existing:
+        raise HTTPException(status_code=400, detail="Intern already exists")
+    
+    # Validate batch exists if provided
+    if intern_data.batch:
+        batch = await db.batches.find_one({"batchId": intern_data.batch})
+        if not batch:
+            raise HTTPException(status_code=404, detail="Batch not found")
+        
+        # Check max capacity
+        current_count = await db.interns.count_documents({"batch": intern_data.batch})
+        if current_count >= batch.get("maxInterns", 50):
+            raise HTTPException(status_code=400, detail="Batch is full")
+    
+    intern_dict = intern_data.model_dump()
+    if not intern_dict.get("organization"):
+        raise HTTPException(status_code=400, detail="Organization is required for interns")
+    intern_dict["status"] = "onboarding"
+    intern_dict["taskCount"] = 0
+    intern_dict["completedTasks"] = 0
+    intern_dict["dsuStreak"] = 0
+    intern_dict["joinedDate"] = date.today()
+    intern_dict["created_at"] = datetime.now(timezone.utc)
+    intern_dict["updated_at"] = datetime.now(timezone.utc)
+    
+    result = await db.interns.insert_one(intern_dict)
+    await record_change(db, "interns", after=intern_dict)
+    intern_dict["_id"] = str(result.inserted_id)
+    intern_dict["joinedDate"] = intern_dict["joinedDate"].isoformat()
+    
+    return intern_dict
+
+
+@router.get("/api/v1/interns/")
+async def list_interns(
+    status: Optional[str] = Query(None),
+    internType: Optional[str] = Query(None),
+    batch: Optional[str] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="nextCursor of the previous page (instead of skip)"),
+    total: TotalMode = Query("exact", description=TOTAL_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db = Depends(get_database),
+    current_user: TokenPrincipal = Depends(get_token_principal)
+):
+    """List all interns with filters and pagination"""
+    query = {}
+    if status:
+        query["status"] = status
+    if internType:
+        query["internType"] = internType
+    if batch:
+        query["batch"] = batch
+    
+    projection = projection_for(fields, INTERN_FIELDS, INTERN_SUMMARY_FIELDS)
+    (interns, next_cursor), total_count = await with_total(
+        find_page(db.interns, query, INTERN_SORT, skip, limit, cursor, projection), db.interns, query, total
+    )
+    return {
+        "items": interns,
+        "total": total_count,
+        "skip": skip,
+        "limit": limit,
+        "nextCursor": next_cursor
+    }
+
+
+@router.get("/api/v1/interns/{intern_id}")
+async def get_intern(
+    intern_id: str,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get intern by ID"""
+    intern = await db.interns.find_one({"_id": ObjectId(intern_id)})
+    if not intern:
+        raise HTTPException(status_code=404, detail="Intern not found")
+    
+    intern["_id"] = str(intern["_id"])
+    if "joinedDate" in intern and isinstance(intern["joinedDate"], date):
+        intern["joinedDate"] = intern["joinedDate"].isoformat()
+    
+    return intern
+
+
+@router.patch("/api/v1/interns/{intern_id}")
+async def update_intern(
+    intern_id: str,
+    intern_update: InternUpdate,
+    db = Depends(get_database),
+    admin: User = Depends(get_admin_user)
+):
+    """Update intern (admin only)"""
+    update_data = intern_update.model_dump(exclude_unset=True)
+    if not update_data:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    
+    update_data["updated_at"] = datetime.now(timezone.utc)
+    
+    before = await db.interns.find_one_and_update(
+        {"_id": ObjectId(intern_id)},
+        {"$set": update_data},
+        return_document=ReturnDocument.BEFORE
+    )
+    
+    if not before:
+        raise HTTPException(status_code=404, detail="Intern not found")
+    
+    result = apply_set(before, update_data)
+    await record_change(db, "interns", before, result)
+    forget_intern(before["_id"])
+    
+    result["_id"] = str(result["_id"])
+    if "joinedDate" in result and isinstance(result["joinedDate"], date):
+        result["joinedDate"] = result["joinedDate"].isoformat()
+    
+    return result
+
+
+@router.delete("/api/v1/interns/{intern_id}", status_code=204)
+async def delete_intern(
+    intern_id: str,
+    db = Depends(get_database),
+    admin: User = Depends(get_admin_user)
+):
+    """Delete intern (admin only)"""
+    deleted = await db.interns.find_one_and_delete({"_id": ObjectId(intern_id)})
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Intern not found")
+    await record_change(db, "interns", before=deleted)
+    forget_intern(deleted["_id"])
+    return None
+
+
+# ==================== MY PROFILE ROUTES ====================
+@router.get("/api/v1/interns/me/profile")
+async def get_my_profile(
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get current user's intern profile"""
+    
+    intern = await db.interns.find_one({"email": current_user.email})
+    
+    if not intern:
+        
+        return {
+            "exists": False,
+            "message": "Profile not found"
+        }
+    
+    intern["_id"] = str(intern["_id"])
+    if "joinedDate" in intern and isinstance(intern["joinedDate"], date):
+        intern["joinedDate"] = intern["joinedDate"].isoformat()
+    
+    return {
+        "exists": True,
+        "data": intern
+    }
+
+
+@router.put("/api/v1/interns/me/profile")
+async def update_my_profile(
+    profile_data: dict,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Update current user's intern profile"""
+    
+    intern = await db.interns.find_one({"email": current_user.email})
+    
+    update_data = {}
+    
+    
+    if "startDate" in profile_data:
+        update_data["startDate"] = profile_data["startDate"]
+    if "joinedDate" in profile_data:
+        update_data["joinedDate"] = profile_data["joinedDate"]
+    if "endDate" in profile_data:
+        update_data["endDate"] = profile_data["endDate"]
+    
+
+    allowed_fields = ["currentProject", "mentor", "skills", "phone", 
+                     "internType", "payType", "college", "degree", "batch"]
+    
+    for field in allowed_fields:
+        if field in profile_data:
+            update_data[field] = profile_data[field]
+    
+    update_data["updated_at"] = datetime.now(timezone.utc)
+    
+    if intern:
+        # Update existing profile
+        before = await db.interns.find_one_and_update(
+            {"email": current_user.email},
+            {"$set": update_data},
+            return_document=ReturnDocument.BEFORE
+        )
+        result = apply_set(before, update_data) if before else None
+        if before:
+            await record_change(db, "interns", before, result)
+            forget_intern(before["_id"])
+    else:
+        # Create new intern profile
+        update_data["email"] = current_user.email
+        update_data["name"] = current_user.name
+        update_data["status"] = "active"
+        update_data["taskCount"] = 0
+        update_data["completedTasks"] = 0
+        update_data["dsuStreak"] = 0
+        update_data["created_at"] = datetime.now(timezone.utc)
+        
+        result_insert = await db.interns.insert_one(update_data)
+        await record_change(db, "interns", after=update_data)
+        result = await db.interns.find_one({"_id": result_insert.inserted_id})
+    
+    if result:
+        result["_id"] = str(result["_id"])
+        if "joinedDate" in result and isinstance(result["joinedDate"], date):
+            result["joinedDate"] = result["joinedDate"].isoformat()
+        return {"success": True, "data": result}
+    
+    raise HTTPException(status_code=500, detail="Failed to update profile")
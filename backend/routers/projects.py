@@ -0,0 +1,233 @@
+"""
+Project routes
+"""
+
+from datetime import datetime, date, timezone
+from typing import List
+
+from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from pydantic import BaseModel
+
+from database import get_database
+from auth import get_current_active_user, get_admin_user
+from intern_refs import attach_interns
+from utils.helpers import parse_object_id
+from utils.responses import FastJSONRoute
+from models import User, ProjectCreate, ProjectUpdate
+
+class ProjectAssign(BaseModel):
+    internIds: List[str]
+
+
+router = APIRouter(tags=["projects"], route_class=FastJSONRoute)
+
+
+@router.post("/api/v1/projects/", status_code=201)
+async def create_project(
+    project_data: ProjectCreate,
+    db = Depends(get_database),
+    admin: User = Depends(get_admin_user)
+):
+    """Create new project (admin only)"""
+    existing = await db.projects.find_one({"name": project_data.name})
+    if existing:
+        raise HTTPException(status_code=400, detail="Project already exists")
+    
+    project_dict = project_data.model_dump()
+    project_dict["status"] = "active"
+    project_dict["internIds"] = project_dict.get("internIds", []) or []
+    project_dict["created_at"] = datetime.now(timezone.utc)
+    project_dict["updated_at"] = datetime.now(timezone.utc)
+
+    # Convert datetime.date → datetime.datetime so BSON/PyMongo can encode them
+    for field in ("startDate", "endDate"):
+        val = project_dict.get(field)
+        if isinstance(val, date) and not isinstance(val, datetime):
+            project_dict[field] = datetime(val.year, val.month, val.day, tzinfo=timezone.utc)
+
+    result = await db.projects.insert_one(project_dict)
+    project_dict["_id"] = str(result.inserted_id)
+    
+    return project_dict
+
+
+@router.get("/api/v1/projects/")
+async def list_projects(
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """List all projects"""
+    projects = await db.projects.find().to_list(None)
+    
+    return projects
+
+
+@router.get("/api/v1/projects/assigned")
+async def list_assigned_projects(
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """List projects assigned to the current intern"""
+    intern = await db.interns.find_one({"email": current_user.email})
+    if not intern:
+        return []
+
+    intern_id = str(intern["_id"])
+    projects = await db.projects.find({"internIds": intern_id}).to_list(None)
+    return projects
+
+
+@router.patch("/api/v1/projects/{project_id}")
+async def update_project(
+    project_id: str,
+    project_update: ProjectUpdate,
+    db = Depends(get_database),
+    admin: User = Depends(get_admin_user)
+):
+    """Update a project (admin only)"""
+    update_data = project_update.model_dump(exclude_unset=True)
+    if not update_data:
+        raise HTTPException(status_code=400, detail="No fields to update")
+
+    # Convert datetime.date → datetime.datetime so BSON/PyMongo can encode them
+    for field in ("startDate", "endDate"):
+        val = update_data.get(field)
+        if isinstance(val, date) and not isinstance(val, datetime):
+            update_data[field] = datetime(val.year, val.month, val.day, tzinfo=timezone.utc)
+
+    update_data["updated_at"] = datetime.now(timezone.utc)
+    result = await db.projects.find_one_and_update(
+        {"_id": parse_object_id(project_id, "project")},
+        {"$set": update_data},
+        return_document=True
+    )
+
+    if not result:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    result["_id"] = str(result["_id"])
+    return result
+
+
+@router.post("/api/v1/projects/{project_id}/interns")
+async def assign_project_interns(
+    project_id: str,
+    payload: ProjectAssign,
+    db = Depends(get_database),
+    admin: User = Depends(get_admin_user)
+):
+    """Assign interns to a project (admin only)"""
+    if not payload.internIds:
+        raise HTTPException(status_code=400, detail="No interns provided")
+
+    project = await db.projects.find_one({"_id": parse_object_id(project_id, "project")})
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    valid_ids = []
+    for intern_id in payload.internIds:
+        intern = await db.interns.find_one({"_id": parse_object_id(intern_id, "intern")})
+        if intern:
+            valid_ids.append(intern_id)
+
+    if not valid_ids:
+        raise HTTPException(status_code=404, detail="No valid interns found")
+
+    await db.projects.update_one(
+        {"_id": project["_id"]},
+        {"$addToSet": {"internIds": {"$each": valid_ids}}, "$set": {"updated_at": datetime.now(timezone.utc)}}
+    )
+
+    await db.interns.update_many(
+        {"_id": {"$in": [parse_object_id(i, "intern") for i in valid_ids]}},
+        {"$set": {"currentProject": project.get("name"), "updated_at": datetime.now(timezone.utc)}}
+    )
+
+    updated = await db.projects.find_one({"_id": project["_id"]})
+    updated["_id"] = str(updated["_id"])
+    return updated
+
+
+@router.get("/api/v1/projects/{project_id}/updates")
+async def get_project_updates(
+    project_id: str,
+    limit: int = Query(10, ge=1, le=50),
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get latest task updates for a project"""
+    project = await db.projects.find_one({"_id": parse_object_id(project_id, "project")})
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    tasks = []
+    cursor = db.tasks.find({"project": project.get("name")}).sort([
+        ("updated_at", -1),
+        ("created_at", -1)
+    ]).limit(limit)
+
+    intern_cache = {}
+    async for task in cursor:
+        intern_id = task.get("internId")
+        if intern_id:
+            if intern_id not in intern_cache:
+                intern = await db.interns.find_one({"_id": parse_object_id(intern_id, "intern")})
+                intern_cache[intern_id] = intern.get("name") if intern else None
+            task["internName"] = intern_cache.get(intern_id)
+        tasks.append(task)
+
+    return tasks
+
+
+@router.get("/api/v1/projects/my-projects")
+async def get_my_projects(
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get all projects assigned to the current intern
+    """
+    if current_user.role != "intern":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, 
+            detail="Only interns can access this endpoint"
+        )
+    
+    # Find intern profile by email
+    intern = await db.interns.find_one({"email": current_user.email})
+    if not intern:
+        return []
+    
+    # Get intern's ID
+    intern_id = str(intern["_id"])
+    
+
+    projects = await db.projects.find({"internIds": intern_id}).to_list(None)
+    
+    return projects
+
+
+@router.get("/api/v1/projects/{project_id}/tasks")
+async def get_project_tasks(
+    project_id: str,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get all tasks for a specific project
+    """
+    # Verify project exists
+    try:
+        project = await db.projects.find_one({"_id": ObjectId(project_id)})
+    except:
+        raise HTTPException(status_code=400, detail="Invalid project ID")
+    
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    # Get tasks for this project
+    tasks = await db.tasks.find({"project": project.get("name")}).to_list(None)
+    
+    # Intern names for all tasks in one query
+    return await attach_interns(db, tasks, {"internName": ("name", "Unknown")})
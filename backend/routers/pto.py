@@ -0,0 +1,240 @@
+"""
+PTO / WFH request routes
+"""
+
+from datetime import datetime, date, timezone
+from typing import Optional
+
+from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pymongo import ReturnDocument
+
+from database import get_analytics_database, get_database
+from auth import get_current_active_user, get_token_principal, TokenPrincipal
+from dashboard_counters import apply_set, record_change
+from intern_refs import INTERN_REF_PROJECTION, attach_interns, intern_lookup, strip_intern_ref, with_intern_ref
+from models import User, PTOCreate, PTOUpdate
+from utils.export import EXPORT_FORMAT_DESCRIPTION, ExportFormat, export_response
+from utils.pagination import (
+    NEWEST_FIRST, TOTAL_DESCRIPTION, TotalMode, aggregate_page, page_query, sort_stage, with_total
+)
+from utils.responses import FastJSONRoute
+
+
+router = APIRouter(tags=["pto"], route_class=FastJSONRoute)
+
+PTO_EXPORT_COLUMNS = (
+    "_id", "internId", "internName", "email", "batch", "team", "type", "leaveType", "startDate", "endDate",
+    "numberOfDays", "reason", "status", "approvedBy", "approvedAt", "comments", "created_at", "updated_at",
+)
+
+
+@router.post("/api/v1/pto/", status_code=201)
+async def create_pto(
+    pto_data: PTOCreate,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Create PTO request"""
+    pto_dict = pto_data.model_dump()
+    pto_dict["type"] = (pto_dict.get("type") or "PTO").upper()
+    if pto_dict["type"] not in ["PTO", "WFH"]:
+        raise HTTPException(status_code=400, detail="Invalid PTO type")
+
+    start_value = pto_dict.get("startDate")
+    end_value = pto_dict.get("endDate")
+
+    if not pto_dict.get("numberOfDays"):
+        if not start_value or not end_value:
+            raise HTTPException(status_code=400, detail="startDate and endDate are required")
+
+        if isinstance(start_value, date) and isinstance(end_value, date):
+            pto_dict["numberOfDays"] = (end_value - start_value).days + 1
+        else:
+            start = datetime.fromisoformat(str(start_value))
+            end = datetime.fromisoformat(str(end_value))
+            pto_dict["numberOfDays"] = (end - start).days + 1
+
+    
+    def normalize_pto_date(value):
+        if isinstance(value, datetime):
+            return value
+        if isinstance(value, date):
+            return datetime.combine(value, datetime.min.time(), tzinfo=timezone.utc)
+        try:
+            return datetime.fromisoformat(str(value))
+        except Exception:
+            return value
+
+    if start_value is not None:
+        pto_dict["startDate"] = normalize_pto_date(start_value)
+    if end_value is not None:
+        pto_dict["endDate"] = normalize_pto_date(end_value)
+
+    if pto_dict["type"] == "PTO" and not pto_dict.get("leaveType"):
+        pto_dict["leaveType"] = "casual"
+
+    intern = None
+    try:
+        intern = await db.interns.find_one({"_id": ObjectId(pto_dict["internId"])})
+    except Exception:
+        intern = None
+
+    if not intern and pto_dict.get("email"):
+        intern = await db.interns.find_one({"email": pto_dict["email"]})
+        if intern:
+            pto_dict["internId"] = str(intern["_id"])
+
+    if intern:
+        pto_dict.setdefault("name", intern.get("name"))
+        pto_dict.setdefault("email", intern.get("email"))
+
+    pto_dict["status"] = "pending"
+    pto_dict["created_at"] = datetime.now(timezone.utc)
+    pto_dict["updated_at"] = datetime.now(timezone.utc)
+    
+    result = await db.pto.insert_one(with_intern_ref(pto_dict))
+    await record_change(db, "pto", after=pto_dict)
+    pto_dict["_id"] = str(result.inserted_id)
+    
+    return strip_intern_ref(pto_dict)
+
+
+def pto_filter(status: Optional[str], type: Optional[str], intern_id: Optional[str]) -> dict:
+    match_stage = {}
+    if status:
+        match_stage["status"] = status
+    if type:
+        match_stage["type"] = type.upper()
+    if intern_id:
+        match_stage["internId"] = intern_id
+    return match_stage
+
+
+@router.get("/api/v1/pto/")
+async def list_ptos(
+    status: Optional[str] = Query(None),
+    type: Optional[str] = Query(None),
+    intern_id: Optional[str] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="nextCursor of the previous page (instead of skip)"),
+    total: TotalMode = Query("exact", description=TOTAL_DESCRIPTION),
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """List PTO requests - Optimized with aggregation pipeline"""
+    match_stage = pto_filter(status, type, intern_id)
+
+    pipeline = [
+        {"$match": page_query(match_stage, NEWEST_FIRST, cursor, skip)},
+        sort_stage(NEWEST_FIRST),
+        {"$skip": skip},
+        {"$limit": limit + 1},
+        *intern_lookup(["name", "email", "batch"], email_fallback=True),
+        {
+            "$addFields": {
+                "type": {"$ifNull": ["$type", "PTO"]},
+                "internName": {
+                    "$ifNull": [
+                        "$name",
+                        {"$arrayElemAt": ["$internDetails.name", 0]},
+                        "Unknown"
+                    ]
+                },
+                "email": {
+                    "$ifNull": [
+                        "$email",
+                        {"$arrayElemAt": ["$internDetails.email", 0]}
+                    ]
+                },
+                "batch": {
+                    "$ifNull": [
+                        "$batch",
+                        {"$arrayElemAt": ["$internDetails.batch", 0]},
+                        ""
+                    ]
+                }
+            }
+        },
+        {"$project": {"internDetails": 0, **INTERN_REF_PROJECTION}}
+    ]
+    
+    (ptos, next_cursor), total_count = await with_total(
+        aggregate_page(db.pto, pipeline, limit, NEWEST_FIRST), db.pto, match_stage, total
+    )
+    return {
+        "items": ptos,
+        "total": total_count,
+        "skip": skip,
+        "limit": limit,
+        "nextCursor": next_cursor
+    }
+
+
+@router.get("/api/v1/pto/export")
+async def export_ptos(
+    format: ExportFormat = Query("ndjson", description=EXPORT_FORMAT_DESCRIPTION),
+    status: Optional[str] = Query(None),
+    type: Optional[str] = Query(None),
+    intern_id: Optional[str] = Query(None),
+    db = Depends(get_analytics_database),
+    current_user: TokenPrincipal = Depends(get_token_principal)
+):
+    """Stream PTO requests matching the list filters as NDJSON or CSV (admin/scrum master)"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    cursor = db.pto.find(pto_filter(status, type, intern_id), INTERN_REF_PROJECTION).sort(NEWEST_FIRST)
+
+    async def enrich(ptos):
+        # Same precedence as the list: values stored on the request win over the intern's
+        for pto in ptos:
+            if pto.get("type") is None:
+                pto["type"] = "PTO"
+            if pto.get("name") is not None:
+                pto["internName"] = pto["name"]
+        await attach_interns(
+            db, ptos, {"internName": ("name", "Unknown"), "email": ("email", None), "batch": ("batch", "")},
+            unresolved={"internName": "Unknown", "batch": ""}, keep_existing=True
+        )
+
+    return export_response(cursor, format, "pto", PTO_EXPORT_COLUMNS, enrich)
+
+
+@router.patch("/api/v1/pto/{pto_id}")
+async def update_pto(
+    pto_id: str,
+    pto_update: PTOUpdate,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Update PTO request (approve/reject)"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    update_data = pto_update.model_dump(exclude_unset=True)
+    if not update_data:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    
+    if "status" in update_data and update_data["status"] in ["approved", "rejected"]:
+        update_data["approvedBy"] = current_user.username
+        update_data["approvedAt"] = datetime.now(timezone.utc)
+    
+    update_data["updated_at"] = datetime.now(timezone.utc)
+    
+    before = await db.pto.find_one_and_update(
+        {"_id": ObjectId(pto_id)},
+        {"$set": update_data},
+        projection=INTERN_REF_PROJECTION,
+        return_document=ReturnDocument.BEFORE
+    )
+    
+    if not before:
+        raise HTTPException(status_code=404, detail="PTO not found")
+    
+    result = apply_set(before, update_data)
+    await record_change(db, "pto", before, result)
+    
+    result["_id"] = str(result["_id"])
+    return result
@@ -0,0 +1,195 @@
+"""
+Task routes
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pymongo import ReturnDocument
+
+from database import get_analytics_database, get_database
+from auth import get_current_active_user, get_token_principal, TokenPrincipal
+from dashboard_counters import apply_set, record_change
+from intern_refs import attach_interns
+from models import User, TaskCreate, TaskUpdate
+from utils.export import EXPORT_FORMAT_DESCRIPTION, ExportFormat, export_response
+from utils.fields import FIELDS_DESCRIPTION, projection_for
+from utils.pagination import NEWEST_FIRST, TOTAL_DESCRIPTION, TotalMode, find_page, with_total
+from utils.responses import FastJSONRoute
+
+
+router = APIRouter(tags=["tasks"], route_class=FastJSONRoute)
+
+TASK_FIELDS = frozenset({
+    "internId", "title", "description", "project", "priority", "status", "assignedBy", "dueDate",
+    "completedDate", "tags", "comments", "task_date", "created_at", "updated_at",
+})
+# Everything the task tables and boards show; leaves out the free-text comments
+TASK_SUMMARY_FIELDS = tuple(sorted(TASK_FIELDS - {"comments"}))
+TASK_EXPORT_COLUMNS = (
+    "_id", "internId", "internName", "title", "description", "project", "priority", "status", "assignedBy",
+    "dueDate", "completedDate", "task_date", "tags", "created_at", "updated_at",
+)
+
+
+@router.post("/api/v1/tasks/", status_code=201)
+async def create_task(
+    task_data: TaskCreate,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Create new task"""
+    task_dict = task_data.model_dump(by_alias=False)
+    
+    if "status" not in task_dict or not task_dict["status"]:
+        task_dict["status"] = "NOT_STARTED"
+    
+    task_dict["created_at"] = datetime.now(timezone.utc)
+    task_dict["updated_at"] = datetime.now(timezone.utc)
+    task_dict["createdBy"] = current_user.username
+    
+    result = await db.tasks.insert_one(task_dict)
+    await record_change(db, "tasks", after=task_dict)
+    
+    # Update intern's task count
+    await db.interns.update_one(
+        {"_id": ObjectId(task_data.internId)},
+        {"$inc": {"taskCount": 1}}
+    )
+    
+    task_dict["_id"] = str(result.inserted_id)
+    
+    if "task_date" in task_dict and task_dict["task_date"]:
+        task_dict["date"] = task_dict["task_date"]
+    
+    return task_dict
+
+
+def task_filter(intern_id: Optional[str], status: Optional[str]) -> dict:
+    query = {}
+    if intern_id:
+        query["internId"] = intern_id
+    if status:
+        query["status"] = status
+    return query
+
+
+@router.get("/api/v1/tasks/")
+async def list_tasks(
+    intern_id: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="nextCursor of the previous page (instead of skip)"),
+    total: TotalMode = Query("exact", description=TOTAL_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db = Depends(get_database),
+    current_user: TokenPrincipal = Depends(get_token_principal)
+):
+    """List tasks with filters and pagination"""
+    query = task_filter(intern_id, status)
+    projection = projection_for(fields, TASK_FIELDS, TASK_SUMMARY_FIELDS, always=("created_at",))
+    (tasks, next_cursor), total_count = await with_total(
+        find_page(db.tasks, query, NEWEST_FIRST, skip, limit, cursor, projection), db.tasks, query, total
+    )
+    for task in tasks:
+        if "task_date" in task and task["task_date"]:
+            task["date"] = task["task_date"]
+    
+    return {
+        "items": tasks,
+        "total": total_count,
+        "skip": skip,
+        "limit": limit,
+        "nextCursor": next_cursor
+    }
+
+
+@router.get("/api/v1/tasks/export")
+async def export_tasks(
+    format: ExportFormat = Query("ndjson", description=EXPORT_FORMAT_DESCRIPTION),
+    intern_id: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    db = Depends(get_analytics_database),
+    current_user: TokenPrincipal = Depends(get_token_principal)
+):
+    """Stream tasks matching the list filters as NDJSON or CSV (admin/scrum master)"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    cursor = db.tasks.find(task_filter(intern_id, status)).sort(NEWEST_FIRST)
+
+    async def enrich(tasks):
+        await attach_interns(db, tasks, {"internName": ("name", "Unknown")}, unresolved={"internName": "Unknown"})
+
+    return export_response(cursor, format, "tasks", TASK_EXPORT_COLUMNS, enrich)
+
+
+@router.patch("/api/v1/tasks/{task_id}")
+async def update_task(
+    task_id: str,
+    task_update: TaskUpdate,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Update task"""
+    update_data = task_update.model_dump(exclude_unset=True, by_alias=False)
+    if not update_data:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    
+    current_task = await db.tasks.find_one({"_id": ObjectId(task_id)})
+    if not current_task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    if update_data.get("status") == "DONE" and current_task.get("status") != "DONE":
+        update_data["completedAt"] = datetime.now(timezone.utc)
+        await db.interns.update_one(
+            {"_id": ObjectId(current_task["internId"])},
+            {"$inc": {"completedTasks": 1}}
+        )
+    
+    update_data["updated_at"] = datetime.now(timezone.utc)
+    
+    before = await db.tasks.find_one_and_update(
+        {"_id": ObjectId(task_id)},
+        {"$set": update_data},
+        return_document=ReturnDocument.BEFORE
+    )
+    if not before:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    result = apply_set(before, update_data)
+    await record_change(db, "tasks", before, result)
+    
+    result["_id"] = str(result["_id"])
+    
+    if "task_date" in result and result["task_date"]:
+        result["date"] = result["task_date"]
+    
+    return result
+
+
+@router.delete("/api/v1/tasks/{task_id}", status_code=204)
+async def delete_task(
+    task_id: str,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Delete task"""
+    task = await db.tasks.find_one({"_id": ObjectId(task_id)})
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    await db.interns.update_one(
+        {"_id": ObjectId(task["internId"])},
+        {"$inc": {"taskCount": -1}}
+    )
+    
+    result = await db.tasks.delete_one({"_id": ObjectId(task_id)})
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Task not found")
+    await record_change(db, "tasks", before=task)
+    
+    return None
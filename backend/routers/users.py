@@ -0,0 +1,505 @@
+"""
+User, admin user-management, reference and mentorship routes
+"""
+
+from datetime import datetime, timezone
+from typing import Optional, Literal
+
+from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pymongo import ReturnDocument
+from pydantic import BaseModel, EmailStr, Field
+
+from database import get_database
+from auth import get_current_active_user, revoke_user_tokens
+from dashboard_counters import apply_set, record_change
+from utils.helpers import parse_object_id
+from utils.pagination import NEWEST_FIRST, TOTAL_DESCRIPTION, TotalMode, find_page, with_total
+from models import (
+    User, UserUpdate, UserResponse, MentorRequestCreate, MentorRequestUpdate
+)
+from utils.responses import FastJSONRoute
+
+
+router = APIRouter(tags=["users"], route_class=FastJSONRoute)
+
+
+# ==================== USER ROUTES ====================
+@router.get("/api/v1/users/me", response_model=UserResponse)
+async def get_current_user_profile(current_user: User = Depends(get_current_active_user)):
+    """Get current user profile"""
+    return UserResponse(
+        id=current_user.id,
+        username=current_user.username,
+        email=current_user.email,
+        name=current_user.name,
+        employee_id=current_user.employee_id,
+        role=current_user.role,
+        is_active=current_user.is_active,
+        is_approved=current_user.is_approved,
+        created_at=current_user.created_at
+    )
+
+
+@router.get("/api/v1/users")
+async def list_basic_users(
+    role: Optional[str] = Query(None, description="Filter by role"),
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """List basic user info for admins and scrum masters"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    query = {}
+    if role:
+        query["role"] = role
+
+    users = []
+    async for user in db.users.find(query).sort("created_at", -1):
+        users.append({
+            "id": str(user["_id"]),
+            "name": user.get("name", ""),
+            "email": user.get("email", ""),
+            "role": user.get("role", "intern")
+        })
+
+    return users
+
+
+# ==================== ADMIN USER MANAGEMENT ROUTES ====================
+@router.get("/api/v1/admin/users")
+async def list_users(
+    pending_only: bool = Query(False, description="Filter to show only pending approval users"),
+    role: Optional[str] = Query(None, description="Filter by role"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="nextCursor of the previous page (instead of skip)"),
+    total: TotalMode = Query("exact", description=TOTAL_DESCRIPTION),
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """List all users (admin only) - Optimized with pagination and projection"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    query = {}
+    if pending_only:
+        query["is_approved"] = False
+    if role:
+        query["role"] = role
+
+    # Use projection to fetch only needed fields
+    projection = {
+        "username": 1,
+        "email": 1,
+        "name": 1,
+        "employee_id": 1,
+        "role": 1,
+        "is_active": 1,
+        "is_approved": 1,
+        "auth_provider": 1,
+        "created_at": 1
+    }
+
+    (rows, next_cursor), total_count = await with_total(
+        find_page(db.users, query, NEWEST_FIRST, skip, limit, cursor, projection), db.users, query, total
+    )
+
+    users = []
+    for user in rows:
+        users.append({
+            "id": str(user["_id"]),
+            "username": user.get("username"),
+            "email": user.get("email"),
+            "name": user.get("name"),
+            "employee_id": user.get("employee_id"),
+            "role": user.get("role"),
+            "is_active": user.get("is_active", True),
+            "is_approved": user.get("is_approved", False),
+            "auth_provider": user.get("auth_provider"),
+            "created_at": user.get("created_at")
+        })
+
+    return {
+        "items": users,
+        "total": total_count,
+        "skip": skip,
+        "limit": limit,
+        "nextCursor": next_cursor
+    }
+
+
+@router.get("/api/v1/admin/users/pending")
+async def list_pending_users(
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """List users pending approval (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    users = []
+    async for user in db.users.find({"is_approved": False}).sort("created_at", -1):
+        users.append({
+            "id": str(user["_id"]),
+            "username": user.get("username"),
+            "email": user.get("email"),
+            "name": user.get("name"),
+            "employee_id": user.get("employee_id"),
+            "role": user.get("role"),
+            "is_active": user.get("is_active", True),
+            "is_approved": False,
+            "auth_provider": user.get("auth_provider"),
+            "created_at": user.get("created_at")
+        })
+
+    return users
+
+
+@router.patch("/api/v1/admin/users/{user_id}")
+async def update_user(
+    user_id: str,
+    user_update: UserUpdate,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Update user - approve and assign role (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    update_data = user_update.model_dump(exclude_unset=True)
+    if not update_data:
+        raise HTTPException(status_code=400, detail="No fields to update")
+
+    update_data["updated_at"] = datetime.now(timezone.utc)
+
+    before = await db.users.find_one_and_update(
+        {"_id": ObjectId(user_id)},
+        {"$set": update_data},
+        return_document=ReturnDocument.BEFORE
+    )
+
+    if not before:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    result = apply_set(before, update_data)
+    await record_change(db, "users", before, result)
+
+    # Also reaches the principals cached by other workers
+    await revoke_user_tokens(db, result.get("username"))
+
+    return {
+        "id": str(result["_id"]),
+        "username": result.get("username"),
+        "email": result.get("email"),
+        "name": result.get("name"),
+        "employee_id": result.get("employee_id"),
+        "role": result.get("role"),
+        "is_active": result.get("is_active", True),
+        "is_approved": result.get("is_approved", False),
+        "auth_provider": result.get("auth_provider"),
+        "created_at": result.get("created_at"),
+        "updated_at": result.get("updated_at")
+    }
+
+
+@router.delete("/api/v1/admin/users/{user_id}", status_code=204)
+async def delete_user(
+    user_id: str,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Delete user (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    # Prevent deleting self
+    if str(current_user.id) == user_id:
+        raise HTTPException(status_code=400, detail="Cannot delete your own account")
+
+    deleted = await db.users.find_one_and_delete({"_id": ObjectId(user_id)})
+    if not deleted:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    await revoke_user_tokens(db, deleted.get("username"))
+    await record_change(db, "users", before=deleted)
+
+    return None
+
+
+# ==================== REFERENCE MANAGEMENT ROUTES ====================
+class ReferenceCreate(BaseModel):
+    name: str = Field(..., min_length=1)
+    email: EmailStr
+    phone: str = Field(default="")
+    referredBy: str = Field(default="")
+    status: Literal["active", "inactive", "pending"] = "pending"
+    performance: Literal["not-assessed", "poor", "fair", "good", "excellent"] = "not-assessed"
+   
+    
+    class Config:
+        populate_by_name = True
+
+
+class ReferenceUpdate(BaseModel):
+    name: Optional[str] = None
+    email: Optional[EmailStr] = None
+    phone: Optional[str] = None
+    referredBy: Optional[str] = None
+    status: Optional[Literal["active", "inactive", "pending"]] = None
+    performance: Optional[Literal["not-assessed", "poor", "fair", "good", "excellent"]] = None
+
+
+@router.post("/api/v1/admin/references", status_code=201)
+async def create_reference(
+    reference_data: ReferenceCreate,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Create a new reference entry"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    existing = await db.references.find_one({"email": reference_data.email})
+    if existing:
+        raise HTTPException(status_code=400, detail="Reference with this email already exists")
+    
+    reference_dict = reference_data.model_dump()
+    reference_dict["created_at"] = datetime.now(timezone.utc)
+    reference_dict["updated_at"] = datetime.now(timezone.utc)
+    reference_dict["createdBy"] = current_user.username
+    
+    result = await db.references.insert_one(reference_dict)
+    reference_dict["_id"] = str(result.inserted_id)
+    
+    return reference_dict
+
+
+@router.get("/api/v1/admin/references")
+async def list_references(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="nextCursor of the previous page (instead of skip)"),
+    total: TotalMode = Query("exact", description=TOTAL_DESCRIPTION),
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """List all references"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    (references, next_cursor), total_count = await with_total(
+        find_page(db.references, {}, NEWEST_FIRST, skip, limit, cursor), db.references, {}, total
+    )
+    return {
+        "items": references,
+        "total": total_count,
+        "skip": skip,
+        "limit": limit,
+        "nextCursor": next_cursor
+    }
+
+
+@router.patch("/api/v1/admin/references/{reference_id}")
+async def update_reference(
+    reference_id: str,
+    reference_update: ReferenceUpdate,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Update a reference entry"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    update_data = reference_update.model_dump(exclude_unset=True)
+    if not update_data:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    
+    update_data["updated_at"] = datetime.now(timezone.utc)
+    
+    result = await db.references.find_one_and_update(
+        {"_id": ObjectId(reference_id)},
+        {"$set": update_data},
+        return_document=True
+    )
+    
+    if not result:
+        raise HTTPException(status_code=404, detail="Reference not found")
+    
+    result["_id"] = str(result["_id"])
+    return result
+
+
+@router.delete("/api/v1/admin/references/{reference_id}", status_code=204)
+async def delete_reference(
+    reference_id: str,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Delete a reference entry"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    result = await db.references.delete_one({"_id": ObjectId(reference_id)})
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Reference not found")
+    
+    return None
+
+
+# ==================== MENTORSHIP ROUTES ====================
+@router.post("/api/v1/mentor-requests", status_code=201)
+async def create_mentor_request(
+    payload: MentorRequestCreate,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Create a mentorship request (intern/scrum master)"""
+    if current_user.role not in ["intern", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    requester_id = str(current_user.id)
+    if requester_id == payload.mentorUserId:
+        raise HTTPException(status_code=400, detail="Cannot request yourself as mentor")
+
+    mentor_user = await db.users.find_one({"_id": parse_object_id(payload.mentorUserId, "mentor")})
+    if not mentor_user or mentor_user.get("role") != "intern":
+        raise HTTPException(status_code=404, detail="Mentor not found")
+
+    existing = await db.mentor_requests.find_one({
+        "requesterUserId": requester_id,
+        "mentorUserId": payload.mentorUserId,
+        "status": "pending"
+    })
+    if existing:
+        raise HTTPException(status_code=400, detail="Request already pending")
+
+    record = {
+        "requesterUserId": requester_id,
+        "requesterEmail": current_user.email,
+        "requesterName": current_user.name,
+        "mentorUserId": payload.mentorUserId,
+        "mentorEmail": mentor_user.get("email"),
+        "mentorName": mentor_user.get("name"),
+        "status": "pending",
+        "created_at": datetime.now(timezone.utc),
+        "updated_at": datetime.now(timezone.utc)
+    }
+
+    result = await db.mentor_requests.insert_one(record)
+    record["_id"] = str(result.inserted_id)
+    return record
+
+
+@router.get("/api/v1/mentor-requests")
+async def list_mentor_requests(
+    status: Optional[str] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="nextCursor of the previous page (instead of skip)"),
+    total: TotalMode = Query("exact", description=TOTAL_DESCRIPTION),
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """List mentorship requests (admin/scrum master) - Optimized with pagination"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    query = {}
+    if status:
+        query["status"] = status
+
+    (requests, next_cursor), total_count = await with_total(
+        find_page(db.mentor_requests, query, NEWEST_FIRST, skip, limit, cursor), db.mentor_requests, query, total
+    )
+    return {
+        "items": requests,
+        "total": total_count,
+        "skip": skip,
+        "limit": limit,
+        "nextCursor": next_cursor
+    }
+
+
+@router.get("/api/v1/mentor-requests/me")
+async def list_my_mentor_requests(
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """List mentorship requests for the current user"""
+    user_id = str(current_user.id)
+    query = {
+        "$or": [
+            {"requesterUserId": user_id},
+            {"mentorUserId": user_id}
+        ]
+    }
+
+    return await db.mentor_requests.find(query).sort("created_at", -1).to_list(None)
+
+
+@router.patch("/api/v1/mentor-requests/{request_id}")
+async def update_mentor_request(
+    request_id: str,
+    payload: MentorRequestUpdate,
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Approve or reject mentor request (admin/scrum master)"""
+    if current_user.role not in ["admin", "scrum_master"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    update_data = payload.model_dump()
+    update_data["approvedBy"] = current_user.username
+    update_data["updated_at"] = datetime.now(timezone.utc)
+
+    result = await db.mentor_requests.find_one_and_update(
+        {"_id": parse_object_id(request_id, "mentor request")},
+        {"$set": update_data},
+        return_document=True
+    )
+
+    if not result:
+        raise HTTPException(status_code=404, detail="Mentor request not found")
+
+    result["_id"] = str(result["_id"])
+    return result
+
+
+@router.get("/api/v1/mentorships/me")
+async def get_my_mentorships(
+    db = Depends(get_database),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get approved mentor/mentee relationships for the current user"""
+    user_id = str(current_user.id)
+
+    mentor_request = await db.mentor_requests.find_one({
+        "requesterUserId": user_id,
+        "status": "approved"
+    })
+
+    mentor = None
+    if mentor_request:
+        mentor = {
+            "userId": mentor_request.get("mentorUserId"),
+            "name": mentor_request.get("mentorName"),
+            "email": mentor_request.get("mentorEmail")
+        }
+
+    mentees = []
+    async for req in db.mentor_requests.find({
+        "mentorUserId": user_id,
+        "status": "approved"
+    }):
+        mentees.append({
+            "userId": req.get("requesterUserId"),
+            "name": req.get("requesterName"),
+            "email": req.get("requesterEmail")
+        })
+
+    return {
+        "mentor": mentor,
+        "mentees": mentees
+    }
@@ -0,0 +1,68 @@
+"""
+Uvicorn launcher shared by the root and backend entry points
+
+SERVER_MODE=production runs WEB_CONCURRENCY workers (default: CPU count)
+under uvicorn's process supervisor:
+    kill -HUP <parent pid>    rolling restart (each new worker must be
+                              ready before the old one is terminated)
+    kill -TTIN / -TTOU        add / remove a worker
+Development mode keeps the single-process server and honours RELOAD.
+"""
+import importlib.util
+import os
+from typing import Any, Dict, Optional
+
+SERVER_MODE = os.getenv("SERVER_MODE", "development").lower()
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+
+
+def _env_int(name: str, default: Optional[int] = None) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def worker_count() -> int:
+    """Workers for production mode: WEB_CONCURRENCY, else one per CPU"""
+    return max(1, _env_int("WEB_CONCURRENCY", os.cpu_count() or 1))
+
+
+def get_server_options() -> Dict[str, Any]:
+    """Keyword arguments for uvicorn.run() built from the environment"""
+    production = SERVER_MODE == "production"
+    options: Dict[str, Any] = {
+        "host": HOST,
+        "port": PORT,
+        "workers": worker_count() if production else 1,
+        "loop": "uvloop" if _installed("uvloop") else "asyncio",
+        "http": "httptools" if _installed("httptools") else "h11",
+        # uvicorn's 5s default drops browser connections between request bursts
+        "timeout_keep_alive": _env_int("SERVER_KEEP_ALIVE", 15),
+        "backlog": _env_int("SERVER_BACKLOG", 2048),
+        "limit_concurrency": _env_int("SERVER_LIMIT_CONCURRENCY"),
+        "timeout_graceful_shutdown": _env_int("SERVER_GRACEFUL_TIMEOUT", 30),
+        # Startup (Mongo connect + warm-up) must finish within this on SIGHUP
+        "timeout_worker_healthcheck": _env_int("SERVER_WORKER_READY_TIMEOUT", 30),
+        "proxy_headers": True,
+    }
+    if not production:
+        options["reload"] = os.getenv("RELOAD", "false").lower() == "true"
+    return options
+
+
+def run(app: Any, import_string: str) -> None:
+    """
+    Start uvicorn. Multiple workers and reload need `import_string` so each
+    process can import the app; a single process serves `app` directly.
+    """
+    import uvicorn
+
+    options = get_server_options()
+    if options["workers"] > 1 or options.get("reload"):
+        uvicorn.run(import_string, **options)
+    else:
+        uvicorn.run(app, **options)
@@ -0,0 +1,257 @@
+"""
+Static serving for the frontend build (frontend/dist)
+
+The dist folder is indexed once: every file gets a content-hash ETag and
+br/gzip variants, taken from pre-built `.br`/`.gz` siblings or compressed
+once into STATIC_CACHE_DIR (file names are content hashes, so a rebuilt
+dist never reuses stale output). index.html is kept in memory. The cache
+dir is created with mode 0700 and only used when this user owns it and
+nobody else can write to it; otherwise variants are not built.
+
+The index is an immutable snapshot swapped as a whole, so SPA fallback
+routing is a dict lookup with no filesystem access. It is rebuilt on
+SIGHUP, or when STATIC_WATCH_INTERVAL > 0 and the dist folder changes.
+"""
+import asyncio
+import gzip
+import hashlib
+import importlib
+import importlib.util
+import mimetypes
+import os
+import signal
+import stat
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Union
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+
+from logging_config import get_logger
+
+logger = get_logger("static")
+
+STATIC_CACHE_DIR = Path(
+    os.getenv("STATIC_CACHE_DIR")
+    or Path(os.getenv("XDG_CACHE_HOME") or Path(os.path.expanduser("~")) / ".cache") / "interns360-static"
+)
+MIN_COMPRESS_SIZE = 1024
+COMPRESSIBLE_SUFFIXES = {".html", ".js", ".mjs", ".css", ".svg", ".json", ".map", ".txt", ".xml", ".ico", ".webmanifest"}
+IN_MEMORY_FILES = ("index.html",)
+# Seconds between dist change checks; 0 disables the watcher (SIGHUP still works)
+STATIC_WATCH_INTERVAL = float(os.getenv("STATIC_WATCH_INTERVAL", "0"))
+
+# Best first; brotli output is only built when the optional package is installed
+ENCODINGS = ("br", "gzip")
+SUFFIX_FOR_ENCODING = {"br": ".br", "gzip": ".gz"}
+_brotli = importlib.import_module("brotli") if importlib.util.find_spec("brotli") else None
+
+Body = Union[Path, bytes]
+
+
+class StaticAsset:
+    """One servable file: media type, ETag and its encoded variants"""
+    __slots__ = ("path", "media_type", "etag", "variants", "body")
+
+    def __init__(self, path: Path, media_type: str, etag: str):
+        self.path = path
+        self.media_type = media_type
+        self.etag = etag
+        self.variants: Dict[str, Body] = {}
+        self.body: Optional[bytes] = None
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        return f'"{self.etag}-{encoding}"' if encoding else f'"{self.etag}"'
+
+
+def _accepted_encodings(header: Optional[str]) -> set:
+    accepted = set()
+    for item in (header or "").split(","):
+        name, _, params = item.strip().partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if name:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def _compress(encoding: str, data: bytes) -> Optional[bytes]:
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == "br" and _brotli is not None:
+        return _brotli.compress(data)
+    return None
+
+
+class StaticIndex:
+    """Content-hashed index of a frontend build directory"""
+
+    def __init__(self, dist_dir: Path, cache_dir: Path = STATIC_CACHE_DIR):
+        self.dist_dir = Path(dist_dir)
+        self.cache_dir = Path(cache_dir)
+        self.assets: Mapping[str, StaticAsset] = MappingProxyType({})
+        self._signature: Optional[tuple] = None
+        self._cache_usable = False
+        self._watcher: Optional[asyncio.Task] = None
+
+    def build(self) -> "StaticIndex":
+        """Hash every file in dist and attach (or build) its compressed variants"""
+        signature = self._dist_signature()
+        self._cache_usable = self._prepare_cache_dir()
+        assets = {}
+        for path in sorted(self.dist_dir.rglob("*")):
+            if not path.is_file() or self._is_variant(path):
+                continue
+            rel_path = path.relative_to(self.dist_dir).as_posix()
+            assets[rel_path] = self._load(rel_path, path)
+        if "index.html" not in assets:
+            raise FileNotFoundError(f"{self.dist_dir / 'index.html'} not found")
+        self.assets = MappingProxyType(assets)
+        self._signature = signature
+        logger.info("static index built", extra={"files": len(assets), "dist": str(self.dist_dir)})
+        return self
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Rebuild when dist changed (or always with force). On failure, e.g. a
+        build still writing dist, the previous snapshot keeps being served.
+        """
+        if not force and self._dist_signature() == self._signature:
+            return False
+        try:
+            self.build()
+        except Exception:
+            logger.exception("static index refresh failed, keeping previous index")
+            return False
+        return True
+
+    async def watch(self, interval: float) -> None:
+        """Poll the dist signature and rebuild off the event loop when it changes"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            await loop.run_in_executor(None, self.refresh)
+
+    def install_reload_triggers(self) -> None:
+        """Rebuild on SIGHUP and start the dist watcher; call from the running loop"""
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGHUP, lambda: loop.run_in_executor(None, self.refresh, True))
+        except (AttributeError, NotImplementedError, RuntimeError, ValueError):
+            pass  # No SIGHUP on Windows, and only the main thread may install handlers
+        if STATIC_WATCH_INTERVAL > 0 and self._watcher is None:
+            self._watcher = loop.create_task(self.watch(STATIC_WATCH_INTERVAL))
+
+    def get(self, rel_path: str) -> Optional[StaticAsset]:
+        return self.assets.get(rel_path)
+
+    @property
+    def index_html(self) -> StaticAsset:
+        return self.assets["index.html"]
+
+    def response(self, asset: StaticAsset, request_headers: Headers) -> Response:
+        """200 with the best accepted encoding, or 304 when the ETag matches"""
+        accepted = _accepted_encodings(request_headers.get("accept-encoding"))
+        encoding = next((name for name in ENCODINGS if name in asset.variants and name in accepted), None)
+        headers = {"ETag": asset.etag_for(encoding)}
+        if asset.variants:
+            headers["Vary"] = "Accept-Encoding"
+
+        if self._not_modified(asset, request_headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            body = asset.variants[encoding]
+        else:
+            body = asset.body if asset.body is not None else asset.path
+
+        if isinstance(body, bytes):
+            return Response(content=body, media_type=asset.media_type, headers=headers)
+        return FileResponse(body, media_type=asset.media_type, headers=headers)
+
+    def _dist_signature(self) -> tuple:
+        """mtimes that change whenever Vite writes a new build"""
+        signature = []
+        for path in (self.dist_dir, self.dist_dir / "assets", self.dist_dir / "index.html"):
+            try:
+                signature.append(path.stat().st_mtime_ns)
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _is_variant(self, path: Path) -> bool:
+        return path.suffix in (".br", ".gz") and path.with_suffix("").is_file()
+
+    def _load(self, rel_path: str, path: Path) -> StaticAsset:
+        data = path.read_bytes()
+        media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        asset = StaticAsset(path, media_type, hashlib.sha256(data).hexdigest()[:20])
+        in_memory = rel_path in IN_MEMORY_FILES
+        if in_memory:
+            asset.body = data
+
+        compressible = path.suffix in COMPRESSIBLE_SUFFIXES and len(data) >= MIN_COMPRESS_SIZE
+        for encoding in ENCODINGS:
+            sibling = path.with_name(path.name + SUFFIX_FOR_ENCODING[encoding])
+            if sibling.is_file():
+                variant: Optional[Body] = sibling
+            elif compressible:
+                variant = self._cached_variant(asset.etag, encoding, data)
+            else:
+                variant = None
+            if variant is None:
+                continue
+            asset.variants[encoding] = variant.read_bytes() if in_memory else variant
+        return asset
+
+    def _prepare_cache_dir(self) -> bool:
+        """Create the cache dir (0700); False unless only this user can write to it"""
+        try:
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            info = self.cache_dir.stat()
+        except OSError:
+            logger.warning("static cache dir not writable", extra={"dir": str(self.cache_dir)})
+            return False
+        owned = not hasattr(os, "getuid") or info.st_uid == os.getuid()
+        if not owned or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            # Files there would be served as-is: never trust a dir others can write to
+            logger.warning("static cache dir not private, skipping it", extra={"dir": str(self.cache_dir)})
+            return False
+        return True
+
+    def _cached_variant(self, etag: str, encoding: str, data: bytes) -> Optional[Path]:
+        """Compressed copy in the cache dir, built on first use; None if not worth it"""
+        if not self._cache_usable:
+            return None
+        target = self.cache_dir / f"{etag}{SUFFIX_FOR_ENCODING[encoding]}"
+        if target.is_file():
+            return target
+        compressed = _compress(encoding, data)
+        if compressed is None or len(compressed) >= len(data):
+            return None
+        try:
+            partial = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+            partial.write_bytes(compressed)
+            os.replace(partial, target)
+        except OSError:
+            logger.warning("static cache dir not writable", extra={"dir": str(self.cache_dir)})
+            return None
+        return target
+
+    @staticmethod
+    def _not_modified(asset: StaticAsset, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        tags = {tag.strip()[2:] if tag.strip().startswith("W/") else tag.strip()
+                for tag in if_none_match.split(",")}
+        if "*" in tags:
+            return True
+        return any(asset.etag_for(encoding) in tags for encoding in (None, *ENCODINGS))
+
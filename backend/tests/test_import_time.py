@@ -0,0 +1,52 @@
+"""
+Cold-start budget: `import main` must stay cheap for autoscaled workers
+
+Measured with `python -X importtime` in a fresh interpreter (best of a few
+runs). Override the budget with IMPORT_TIME_BUDGET_MS on slow machines.
+"""
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "2000"))
+RUNS = 3
+# Only needed by a few requests; imported inside the functions that use them
+DEFERRED_MODULES = ("httpx", "uvicorn", "azure_auth", "otp_email")
+
+# "import time: <self us> | <cumulative us> | <indented module name>"
+_IMPORT_LINE = re.compile(r"^import time:\s+\d+\s+\|\s+(\d+)\s+\|\s+(\S+)$")
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=BACKEND_DIR, capture_output=True, text=True, timeout=120
+    )
+
+
+def _import_main_ms() -> float:
+    """Cumulative import time of `main` in milliseconds"""
+    result = _run("import main", "-X", "importtime")
+    assert result.returncode == 0, result.stderr[-2000:]
+    for line in result.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match and match.group(2) == "main":
+            return int(match.group(1)) / 1000
+    raise AssertionError("`main` missing from -X importtime output")
+
+
+def test_import_main_within_budget():
+    best = min(_import_main_ms() for _ in range(RUNS))
+    assert best <= IMPORT_TIME_BUDGET_MS, f"import main took {best:.0f} ms (budget {IMPORT_TIME_BUDGET_MS:.0f} ms)"
+
+
+def test_heavy_modules_are_deferred():
+    result = _run(
+        "import sys, main; "
+        f"print(','.join(name for name in {DEFERRED_MODULES!r} if name in sys.modules))"
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    assert result.stdout.strip() == "", f"imported at startup: {result.stdout.strip()}"
@@ -0,0 +1,126 @@
+"""
+Small in-process TTL + LRU cache used for hot lookups
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded mapping whose entries expire after `ttl` seconds (LRU eviction)"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def discard_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """Drop every entry for which predicate(key, value) is true"""
+        stale = [key for key, (_, value) in self._data.items() if predicate(key, value)]
+        for key in stale:
+            del self._data[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one computation"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        # A cancelled caller (client went away) must not cancel the shared work
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved here in case every waiter was cancelled
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+
+class ResponseCache:
+    """
+    TTL/LRU cache for computed responses with single-flight misses and
+    tag-based invalidation. A computation that started before its tags
+    were invalidated is returned to its waiters but not cached, and is not
+    shared with callers that arrive after the invalidation.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 5.0):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._flight = SingleFlight()
+        self._generations: Dict[str, int] = {}
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        tags: Iterable[str],
+        factory: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        cached = self._cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            return cached[1]
+
+        tags = frozenset(tags)
+        ordered = sorted(tags)
+        generations = tuple(self._generations.get(tag, 0) for tag in ordered)
+
+        async def compute():
+            value = await factory()
+            if generations == tuple(self._generations.get(tag, 0) for tag in ordered):
+                self._cache.set(key, (tags, value))
+            return value
+
+        # Callers arriving after an invalidation start a fresh computation
+        return await self._flight.do((key, generations), compute)
+
+    def invalidate(self, *tags: str) -> int:
+        """Drop cached responses depending on any of `tags`"""
+        for tag in tags:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+        wanted = set(tags)
+        return self._cache.discard_where(lambda key, item: bool(item[0] & wanted))
+
+    def clear(self) -> None:
+        self._cache.clear()
@@ -0,0 +1,27 @@
+"""
+One-time .env loading shared by every backend module
+"""
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+_loaded = False
+
+
+def load_env() -> None:
+    """Load backend/.env, else the repo-root .env, else the default search (once)"""
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+
+    env_path = BACKEND_DIR / ".env"
+    root_env_path = BACKEND_DIR.parent / ".env"
+    if env_path.exists():
+        load_dotenv(env_path)
+    elif root_env_path.exists():
+        load_dotenv(root_env_path)
+    else:
+        load_dotenv()  # Try default locations
@@ -0,0 +1,126 @@
+"""
+Streaming NDJSON / CSV exports
+
+An export walks one Mongo cursor in chunks of EXPORT_CHUNK_SIZE documents
+(also the cursor's batch size): each chunk is enriched (e.g. intern names
+with one `$in` query), encoded and sent before the next one is fetched.
+StreamingResponse awaits every send, so a slow client pauses the cursor
+instead of the server buffering the result; memory stays around one chunk.
+The cursor is closed however the stream ends, including a disconnect.
+"""
+import csv
+import io
+import os
+from datetime import date, datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Literal, Optional, Sequence
+
+from bson import ObjectId
+from starlette.responses import StreamingResponse
+
+from utils.responses import dumps
+
+ExportFormat = Literal["ndjson", "csv"]
+EXPORT_FORMAT_DESCRIPTION = "ndjson (one JSON document per line) or csv"
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "500"))
+
+# Leading characters a spreadsheet may read as the start of a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+# Called with each chunk before it is encoded (may modify the documents)
+Enrich = Callable[[List[dict]], Awaitable[Any]]
+
+
+async def iter_chunks(cursor, size: int = EXPORT_CHUNK_SIZE) -> AsyncIterator[List[dict]]:
+    chunk = []
+    async for doc in cursor:
+        chunk.append(doc)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _csv_value(value: Any) -> Any:
+    """A CSV cell: dates as ISO strings, lists/objects as JSON"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        # Keep spreadsheet apps from evaluating user text as a formula
+        return "'" + value if value[:1] in FORMULA_PREFIXES else value
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    return dumps(value).decode()
+
+
+async def _ndjson_body(chunks: AsyncIterator[List[dict]], enrich: Optional[Enrich]) -> AsyncIterator[bytes]:
+    async for chunk in chunks:
+        if enrich:
+            await enrich(chunk)
+        yield b"".join(dumps(doc) + b"\n" for doc in chunk)
+
+
+async def _csv_body(
+    chunks: AsyncIterator[List[dict]],
+    enrich: Optional[Enrich],
+    columns: Sequence[str]
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for chunk in chunks:
+        if enrich:
+            await enrich(chunk)
+        writer.writerows([_csv_value(doc.get(column)) for column in columns] for doc in chunk)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()  # Header only: nothing matched
+
+
+async def _closing(body: AsyncIterator[bytes], cursor) -> AsyncIterator[bytes]:
+    try:
+        async for part in body:
+            yield part
+    finally:
+        await body.aclose()
+        await cursor.close()  # Frees the server-side cursor early on errors/disconnects
+
+
+class ExportResponse(StreamingResponse):
+    """StreamingResponse that closes its body (and so the cursor) when the stream stops"""
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            # Starlette leaves an abandoned body iterator to the garbage collector
+            await self.body_iterator.aclose()
+
+
+def export_response(
+    cursor,
+    fmt: ExportFormat,
+    name: str,
+    columns: Sequence[str],
+    enrich: Optional[Enrich] = None
+) -> ExportResponse:
+    """
+    Stream `cursor` as an attachment named `<name>-<YYYYMMDD>.<fmt>`. NDJSON
+    lines are whole documents; CSV rows hold `columns` in order.
+    """
+    chunks = iter_chunks(cursor.batch_size(EXPORT_CHUNK_SIZE))
+    body = _csv_body(chunks, enrich, columns) if fmt == "csv" else _ndjson_body(chunks, enrich)
+    filename = f"{name}-{datetime.now(timezone.utc):%Y%m%d}.{fmt}"
+    return ExportResponse(
+        _closing(body, cursor),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
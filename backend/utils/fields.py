@@ -0,0 +1,47 @@
+"""
+Sparse fieldsets for list endpoints
+
+`fields=` is a comma-separated whitelist of document fields, "summary"
+(the default: what the table views use) or "all" (the whole document).
+It becomes a Mongo projection, so unused fields are neither read nor sent.
+"""
+from typing import Iterable, Optional
+
+from fastapi import HTTPException
+
+FIELDS_DESCRIPTION = 'Comma-separated fields to return, "summary" (default) or "all"'
+
+INTERN_FIELDS = frozenset({
+    "name", "email", "phone", "organization", "college", "degree", "branch", "year", "cgpa",
+    "domain", "internType", "type", "isPaid", "payType", "batch", "mentor", "startDate", "endDate",
+    "joinedDate", "skills", "status", "currentProject", "taskCount", "completedTasks", "dsuStreak",
+    "role", "created_at", "updated_at",
+})
+INTERN_SUMMARY_FIELDS = (
+    "name", "email", "batch", "status", "internType", "type", "domain", "currentProject", "mentor",
+    "organization", "startDate", "endDate", "joinedDate", "role", "taskCount", "completedTasks", "dsuStreak",
+)
+
+
+def projection_for(
+    fields: Optional[str],
+    allowed: Iterable[str],
+    summary: Iterable[str],
+    always: Iterable[str] = ()
+) -> Optional[dict]:
+    """
+    Projection for a `fields=` value; None means the whole document.
+    `always` fields (e.g. sort keys) are included regardless. 400 on
+    fields outside `allowed`.
+    """
+    value = (fields or "summary").strip()
+    if value == "all":
+        return None
+    if value == "summary":
+        selected = list(summary)
+    else:
+        selected = [field.strip() for field in value.split(",") if field.strip()]
+        unknown = sorted(set(selected) - set(allowed) - {"_id"})
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return {field: 1 for field in (*selected, *always)}
@@ -0,0 +1,34 @@
+"""
+Shared request parsing helpers for the API routers
+"""
+from datetime import datetime, date
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+
+def normalize_email(email: str) -> str:
+    """Normalize email to lowercase for consistent storage and lookup"""
+    return email.lower().strip() if email else email
+
+
+def parse_date(value: object) -> date:
+    """Parse date or datetime inputs from API payloads."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+        except ValueError:
+            return date.fromisoformat(value)
+    raise ValueError("Unsupported date format")
+
+
+def parse_object_id(value: str, label: str) -> ObjectId:
+    """Validate and convert a string to ObjectId."""
+    try:
+        return ObjectId(value)
+    except Exception:
+        raise HTTPException(status_code=400, detail=f"Invalid {label} id")
@@ -0,0 +1,143 @@
+"""
+Keyset (cursor) pagination helpers
+
+A cursor is the sort key of the last document of a page, encoded as
+URL-safe base64 of extended JSON (so datetimes and ObjectIds round-trip).
+The next page matches documents strictly after that key, which uses the
+sort index instead of skipping over every earlier document.
+
+Totals are counted concurrently with the page (`with_total`) in one of
+three modes: exact (cached per filter for COUNT_CACHE_TTL_SECONDS),
+estimate (collection metadata for an unfiltered list, otherwise a count
+capped at ESTIMATE_COUNT_CAP) or none.
+"""
+import asyncio
+import base64
+import binascii
+import os
+from typing import Awaitable, List, Literal, Optional, Tuple, TypeVar
+
+from bson import json_util
+from fastapi import HTTPException
+from pymongo import ASCENDING, DESCENDING
+
+from utils.cache import TTLCache
+
+# [(field, ASCENDING | DESCENDING), ...]; the last field must be unique (_id)
+SortSpec = List[Tuple[str, int]]
+
+NEWEST_FIRST: SortSpec = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+TotalMode = Literal["exact", "estimate", "none"]
+TOTAL_DESCRIPTION = "exact (default), estimate (fast, capped for filtered lists) or none"
+COUNT_CACHE_TTL_SECONDS = float(os.getenv("COUNT_CACHE_TTL_SECONDS", "5"))
+ESTIMATE_COUNT_CAP = int(os.getenv("ESTIMATE_COUNT_CAP", "10000"))
+
+_count_cache = TTLCache(maxsize=1024, ttl=COUNT_CACHE_TTL_SECONDS)
+
+T = TypeVar("T")
+
+
+def encode_cursor(doc: dict, sort: SortSpec) -> str:
+    """Cursor pointing just after `doc` in `sort` order"""
+    payload = json_util.dumps([doc.get(field) for field, _ in sort])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: SortSpec) -> dict:
+    """Sort-key values from a cursor; 400 when it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {field: value for (field, _), value in zip(sort, values)}
+
+
+def keyset_filter(sort: SortSpec, after: dict) -> dict:
+    """
+    Filter for documents after `after` in `sort` order. Missing/null values
+    sort lowest, matching MongoDB's own ordering, and are matched explicitly
+    because range operators never match null.
+    """
+    clauses = []
+    for index, (field, direction) in enumerate(sort):
+        ties = {name: after[name] for name, _ in sort[:index]}
+        value = after[field]
+        if value is None:
+            if direction != ASCENDING:
+                continue  # Nothing sorts below null
+            beyond = {field: {"$ne": None}}
+        elif direction == ASCENDING:
+            beyond = {field: {"$gt": value}}
+        else:
+            beyond = {"$or": [{field: {"$lt": value}}, {field: None}]}
+        clauses.append({**ties, **beyond})
+    return {"$or": clauses} if clauses else {"_id": {"$exists": False}}
+
+
+def page_query(query: dict, sort: SortSpec, cursor: Optional[str], skip: int = 0) -> dict:
+    """`query` restricted to the documents after `cursor` (skip and cursor are exclusive)"""
+    if not cursor:
+        return query
+    if skip:
+        raise HTTPException(status_code=400, detail="Use either skip or cursor, not both")
+    after = keyset_filter(sort, decode_cursor(cursor, sort))
+    return {"$and": [query, after]} if query else after
+
+
+def sort_stage(sort: SortSpec) -> dict:
+    return {"$sort": dict(sort)}
+
+
+async def find_page(
+    collection,
+    query: dict,
+    sort: SortSpec,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    projection: Optional[dict] = None
+) -> Tuple[list, Optional[str]]:
+    """One page of `collection.find(query)` by skip or cursor, and the next page's cursor"""
+    docs = await collection.find(page_query(query, sort, cursor, skip), projection) \
+        .sort(sort).skip(skip).limit(limit + 1).to_list(limit + 1)
+    return split_page(docs, limit, sort)
+
+
+async def aggregate_page(collection, pipeline: list, limit: int, sort: SortSpec) -> Tuple[list, Optional[str]]:
+    """Like find_page for a pipeline that sorts by `sort` and fetches `limit + 1`"""
+    return split_page(await collection.aggregate(pipeline).to_list(None), limit, sort)
+
+
+def split_page(docs: list, limit: int, sort: SortSpec) -> Tuple[list, Optional[str]]:
+    """Trim a `limit + 1` fetch to the page and the cursor of the next one"""
+    if len(docs) <= limit:
+        return docs, None
+    page = docs[:limit]
+    return page, encode_cursor(page[-1], sort)
+
+
+async def count_total(collection, query: dict, mode: TotalMode = "exact") -> Optional[int]:
+    """Total for a list response (None for mode "none")"""
+    if mode == "none":
+        return None
+    if mode == "estimate":
+        if not query:
+            return await collection.estimated_document_count()
+        return await collection.count_documents(query, limit=ESTIMATE_COUNT_CAP)
+
+    key = (collection.database.name, collection.name, json_util.dumps(query))
+    cached = _count_cache.get(key)
+    if cached is None:
+        cached = await collection.count_documents(query)
+        _count_cache.set(key, cached)
+    return cached
+
+
+async def with_total(page: Awaitable[T], collection, query: dict, mode: TotalMode = "exact") -> Tuple[T, Optional[int]]:
+    """Await a page fetch and its total concurrently"""
+    result, total = await asyncio.gather(page, count_total(collection, query, mode))
+    return result, total
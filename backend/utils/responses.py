@@ -0,0 +1,85 @@
+"""
+orjson rendering for API responses
+
+FastAPI passes every untyped (dict/list) return value through
+`jsonable_encoder` before rendering it, which dominates CPU for large list
+pages. Routers use FastJSONRoute: untyped async endpoints are wrapped to
+return a FastJSONResponse directly, so Mongo documents are rendered in
+one orjson pass with ObjectId, Decimal128 and date/datetime encoded
+natively. Handlers therefore return documents as read (no `str(_id)`).
+"""
+import inspect
+from decimal import Decimal
+from functools import wraps
+from typing import Any, Callable
+
+import orjson
+from bson import Decimal128, ObjectId
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.responses import Response
+
+
+def _decimal(value: Decimal):
+    # Same as jsonable_encoder: integral values as int, others as float
+    return int(value) if value.as_tuple().exponent >= 0 else float(value)
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Decimal128):
+        return _decimal(obj.to_decimal())
+    if isinstance(obj, Decimal):
+        return _decimal(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", by_alias=True)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _returns_untyped(endpoint: Callable, response_model: Any) -> bool:
+    if isinstance(response_model, DefaultPlaceholder):
+        response_model = response_model.value
+    if response_model is not None or not inspect.iscoroutinefunction(endpoint):
+        return False
+    signature = inspect.signature(endpoint)
+    if signature.return_annotation is not inspect.Signature.empty:
+        return False
+    # Headers/cookies set on an injected Response only survive FastAPI's own rendering
+    return not any(
+        inspect.isclass(param.annotation) and issubclass(param.annotation, Response)
+        for param in signature.parameters.values()
+    )
+
+
+class FastJSONRoute(APIRoute):
+    """APIRoute rendering untyped endpoint results with orjson"""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if _returns_untyped(endpoint, kwargs.get("response_model")):
+            endpoint = _render_fast(endpoint, kwargs.get("status_code") or 200)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _render_fast(endpoint: Callable, status_code: int) -> Callable:
+    @wraps(endpoint)
+    async def fast_endpoint(*args, **kwargs):
+        result = await endpoint(*args, **kwargs)
+        if result is None or isinstance(result, Response) or status_code in (204, 304):
+            return result
+        return FastJSONResponse(result, status_code=status_code)
+    return fast_endpoint
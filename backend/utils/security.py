@@ -1,3 +1,7 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
 pwd_context = CryptContext(
@@ -5,8 +9,55 @@ pwd_context = CryptContext(
     deprecated="auto"
 )
 
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event
+# loop; the semaphore caps how many hashes may queue for it at once.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_slots = None
+_stats = {"running": 0, "waiting": 0, "max_waiting": 0, "completed": 0}
+
+
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+async def _run_in_pool(func, *args):
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(PASSWORD_HASH_MAX_PENDING)
+
+    _stats["waiting"] += 1
+    _stats["max_waiting"] = max(_stats["max_waiting"], _stats["waiting"])
+    try:
+        await _slots.acquire()
+    finally:
+        _stats["waiting"] -= 1
+
+    _stats["running"] += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+    finally:
+        _stats["running"] -= 1
+        _stats["completed"] += 1
+        _slots.release()
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_pool(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_pool(verify_password, plain_password, hashed_password)
+
+
+def get_password_pool_stats() -> dict:
+    """Queue depth and throughput counters for the hashing pool"""
+    return {
+        "workers": PASSWORD_HASH_WORKERS,
+        "maxPending": PASSWORD_HASH_MAX_PENDING,
+        **_stats
+    }
@@ -0,0 +1,79 @@
+"""
+Startup warm-up run from the FastAPI lifespan before the app reports ready
+"""
+import asyncio
+import os
+import time
+from datetime import date, datetime, timezone
+from typing import Awaitable, Callable, List
+
+from database import db
+from logging_config import get_logger
+from models import User, DSUCreate, TaskCreate, PTOCreate
+from utils.security import hash_password_async
+
+logger = get_logger("warmup")
+
+# Defaults to the configured minPoolSize (or 4 when the pool has no minimum)
+WARMUP_CONNECTIONS = int(os.getenv("WARMUP_CONNECTIONS") or int(os.getenv("MONGODB_MIN_POOL_SIZE", "0")) or 4)
+
+_hooks: List[Callable[[], Awaitable[None]]] = []
+
+
+def register_warmup(func: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+    """Register an async callable to run during warm-up (e.g. cache priming)"""
+    _hooks.append(func)
+    return func
+
+
+async def _open_pool() -> None:
+    """Check out WARMUP_CONNECTIONS sockets concurrently so the pool is established"""
+    if db.client is None or WARMUP_CONNECTIONS <= 0:
+        return
+    await asyncio.gather(*(db.client.admin.command("ping") for _ in range(WARMUP_CONNECTIONS)))
+
+
+def _build_validators() -> None:
+    """Exercise validation/serialization of the hot request and auth models"""
+    now = datetime.now(timezone.utc)
+    today = date.today()
+    samples = [
+        (User, {"_id": "000000000000000000000000", "username": "warmup", "email": "warmup@example.com",
+                "name": "Warm Up", "created_at": now, "updated_at": now}),
+        (DSUCreate, {"internId": "warmup", "date": today.isoformat(), "yesterday": "-", "today": "-"}),
+        (TaskCreate, {"internId": "warmup", "title": "-", "project": "-", "assignedBy": "-"}),
+        (PTOCreate, {"internId": "warmup", "type": "PTO", "startDate": today.isoformat(),
+                     "endDate": today.isoformat()}),
+    ]
+    for model, payload in samples:
+        model.model_validate(payload).model_dump(mode="json")
+
+
+async def warm_up(app) -> None:
+    """Open the Mongo pool, build validators/OpenAPI, load bcrypt and run hooks"""
+    started = time.perf_counter()
+    steps = {}
+
+    async def _step(name, coro):
+        step_started = time.perf_counter()
+        try:
+            await coro
+        except Exception:
+            logger.exception("warm-up step failed", extra={"step": name})
+        steps[name] = round((time.perf_counter() - step_started) * 1000, 1)
+
+    async def _sync(func):
+        func()
+
+    if getattr(app.state, "db_connected", False):
+        await _step("mongo_pool", _open_pool())
+    await _step("validators", _sync(_build_validators))
+    await _step("openapi", _sync(app.openapi))
+    await _step("bcrypt", hash_password_async("warm-up"))
+    for hook in _hooks:
+        await _step(hook.__name__, hook())
+
+    logger.info(
+        "warm-up complete",
+        extra={"ms": round((time.perf_counter() - started) * 1000, 1), "steps": steps}
+    )
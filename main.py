@@ -31,11 +31,19 @@ spec.loader.exec_module(backend_module)
 app = backend_module.app
 
 # --- Cache-control middleware to prevent stale builds ---
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import MutableHeaders
 
+NO_CACHE_HEADERS = (
+    ("Cache-Control", "no-cache, no-store, must-revalidate"),
+    ("Pragma", "no-cache"),
+    ("Expires", "0"),
+)
+IMMUTABLE_HEADERS = (
+    ("Cache-Control", "public, max-age=31536000, immutable"),
+)
 
-class CacheControlMiddleware(BaseHTTPMiddleware):
+
+class CacheControlMiddleware:
     """
     Sets cache headers so that after a new frontend build, browsers
     pick up the changes without the user having to clear cache.
@@ -46,38 +54,63 @@ class CacheControlMiddleware(BaseHTTPMiddleware):
       (safe because Vite filenames change with content, e.g. index-abc123.js)
     - HTML / SPA routes:    no-cache  (forces browser to always fetch the
       latest index.html which points to the new hashed assets)
+
+    Pure ASGI: headers are patched on `http.response.start`, so the
+    response body is passed through untouched (no task or stream wrapping).
     """
 
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        path = request.url.path
+    # (path prefix, headers); first match wins, anything else is an HTML/SPA route
+    RULES = (
+        ("/api/", NO_CACHE_HEADERS),
+        ("/assets/", IMMUTABLE_HEADERS),
+    )
+    DEFAULT = NO_CACHE_HEADERS
+
+    def __init__(self, app):
+        self.app = app
+
+    @classmethod
+    def headers_for(cls, path: str):
+        for prefix, headers in cls.RULES:
+            if path.startswith(prefix):
+                return headers
+        return cls.DEFAULT
 
-        if path.startswith("/api/"):
-            # API: never cache
-            response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-            response.headers["Pragma"] = "no-cache"
-            response.headers["Expires"] = "0"
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        elif path.startswith("/assets/"):
-            # Vite hashed bundles: cache forever (filename changes on rebuild)
-            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        cache_headers = self.headers_for(scope["path"])
 
-        else:
-            # HTML pages, SPA routes, root: never cache
-            response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-            response.headers["Pragma"] = "no-cache"
-            response.headers["Expires"] = "0"
+        async def send_with_cache_headers(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                headers = MutableHeaders(scope=message)
+                for name, value in cache_headers:
+                    headers[name] = value
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_with_cache_headers)
 
 
 app.add_middleware(CacheControlMiddleware)
 
 # --- Serve frontend build if dist folder exists ---
 if FRONTEND_DIST.exists() and (FRONTEND_DIST / "index.html").exists():
-    from fastapi.staticfiles import StaticFiles
-    from fastapi.responses import FileResponse, JSONResponse
+    from fastapi import Request
+    from fastapi.responses import JSONResponse
     from starlette.routing import Route
+    from static_assets import StaticIndex
+    from warmup import register_warmup
+
+    # Hashes dist once and prepares br/gzip variants; index.html stays in memory.
+    # Rebuilt on SIGHUP or, with STATIC_WATCH_INTERVAL set, when dist changes.
+    static_index = StaticIndex(FRONTEND_DIST).build()
+
+    @register_warmup
+    async def static_index_reload():
+        static_index.install_reload_triggers()
 
     # Remove the backend's root GET / route so the frontend is served at /
     app.router.routes = [
@@ -85,33 +118,34 @@ if FRONTEND_DIST.exists() and (FRONTEND_DIST / "index.html").exists():
         if not (isinstance(r, Route) and r.path == "/" and "GET" in (r.methods or set()))
     ]
 
-    # Mount /assets for Vite JS/CSS bundles
-    if (FRONTEND_DIST / "assets").exists():
-        app.mount(
-            "/assets",
-            StaticFiles(directory=str(FRONTEND_DIST / "assets")),
-            name="frontend-assets",
-        )
+    # Vite JS/CSS bundles
+    @app.get("/assets/{asset_path:path}", include_in_schema=False)
+    async def serve_asset(asset_path: str, request: Request):
+        asset = static_index.get(f"assets/{asset_path}")
+        if asset is None:
+            return JSONResponse(status_code=404, content={"detail": "Not Found"})
+        return static_index.response(asset, request.headers)
 
     # Serve index.html at root
     @app.get("/", include_in_schema=False)
-    async def serve_root():
-        return FileResponse(str(FRONTEND_DIST / "index.html"))
+    async def serve_root(request: Request):
+        return static_index.response(static_index.index_html, request.headers)
 
     # SPA catch-all: must be registered last so API routes take priority
     @app.get("/{full_path:path}", include_in_schema=False)
-    async def serve_frontend(full_path: str):
+    async def serve_frontend(full_path: str, request: Request):
         # Return proper 404 for unmatched API paths
         if full_path.startswith("api/"):
             return JSONResponse(status_code=404, content={"detail": "Not found"})
 
-        # Serve static file from dist if it exists (with path-traversal guard)
-        file_path = (FRONTEND_DIST / full_path).resolve()
-        if file_path.is_file() and str(file_path).startswith(str(FRONTEND_DIST.resolve())):
-            return FileResponse(str(file_path))
+        # Serve static file from dist if it exists: a lookup in the startup-built
+        # index (no filesystem access, and only indexed files can ever match)
+        asset = static_index.get(full_path)
+        if asset is not None:
+            return static_index.response(asset, request.headers)
 
         # Everything else gets index.html (client-side routing)
-        return FileResponse(str(FRONTEND_DIST / "index.html"))
+        return static_index.response(static_index.index_html, request.headers)
 
     print(f"Frontend: serving build from {FRONTEND_DIST}")
 else:
@@ -120,6 +154,8 @@ else:
 
 
 if __name__ == "__main__":
-    import uvicorn
-    port = int(os.getenv("PORT", "8000"))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    from server import run
+
+    # Worker processes re-run this file as __mp_main__, which registers
+    # "backend_main" with the frontend routes and middleware already attached.
+    run(app, "backend_main:app")